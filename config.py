@@ -24,3 +24,30 @@ NTFY_URL = f"https://ntfy.sh/{NTFY_TOPIC}"
 # Flask Dashboard
 FLASK_PORT = 5000
 FLASK_HOST = "0.0.0.0"
+
+# Performance Governor (QRB2210 thermal / load management)
+GOVERNOR_INTERVAL       = 1.0     # seconds between resource samples
+GOVERNOR_TEMP_HIGH      = 80.0    # °C — step quality down above this
+GOVERNOR_TEMP_LOW       = 70.0    # °C — allowed to step back up below this
+GOVERNOR_LOAD_HIGH      = 0.9     # busy fraction of all CPUs since the last sample (/proc/stat)
+GOVERNOR_LOAD_LOW       = 0.6
+GOVERNOR_TARGET_FPS     = 15      # per-frame processing budget = 1 / this
+GOVERNOR_LAG_HIGH       = 1.2     # processing time as a multiple of the budget
+GOVERNOR_LAG_LOW        = 0.7
+GOVERNOR_DOWN_SAMPLES   = 2       # consecutive pressured samples before stepping down
+GOVERNOR_UP_SAMPLES     = 10      # consecutive relaxed samples before stepping up
+GOVERNOR_SETTLE_SECONDS = 180.0   # after a step, temperature is not acted on for this long
+                                  # (about twice the SoC's ~90 s thermal time constant)
+
+# Fan-in Hub (optional — leave HUB_URL as None for a standalone device)
+HUB_URL          = None                 # e.g. "http://hub.local:5100"
+DEVICE_ID        = "guardianeye-1"      # unique per device
+DEVICE_ROOM      = "Room 1"             # label shown on the hub dashboard
+HUB_PORT         = 5100
+HUB_REPORT_HZ    = 2                    # device → hub status delta rate
+HUB_FLUSH_HZ     = 4                    # hub → dashboard aggregated update rate
+HUB_NOTIFY_WINDOW = 3.0                 # seconds of events merged into one push
+HUB_EVENT_LOG_MAX = 500                 # events kept hub-wide
+HUB_DEVICE_EVENTS_MAX = 50              # events kept per device
+HUB_NTFY_TOPIC   = "guardianeye-hub-CHANGEME"
+HUB_NTFY_URL     = f"https://ntfy.sh/{HUB_NTFY_TOPIC}"
@@ -0,0 +1,304 @@
+"""Batch offline evaluation of FallDetector / PoseEstimator over video clips.
+
+Clips are spread over a process pool (one MediaPipe landmarker per
+worker), decoded with frame striding, and their keypoints cached on disk
+keyed by clip content hash and model version. Re-runs that only change
+detection logic (fall_detector.py, config.py thresholds) skip inference.
+
+Labels come from --manifest (CSV: clip,label[,fall_start] with label
+fall/adl and fall_start in seconds) or, without one, from the clip's
+parent directory: clips under a "fall" / "falls" directory are falls,
+everything else is ADL (activities of daily living).
+
+Each clip gets a fresh landmarker, so its keypoints never depend on the
+clip its worker processed before. FallDetector's frame-count constants
+are scaled by --stride; they are not scaled for the clips' own frame
+rate, which the summary lists (clip_fps).
+
+Detection latency is only measured for clips with a labelled fall_start.
+A detection more than EARLY_TOLERANCE_S before the onset is scored EARLY:
+a false alarm for precision and a miss for recall.
+
+    python evaluate.py datasets/urfall datasets/incidents --stride 2 --report-dir reports/
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+FALL_LABELS = ("fall", "falls", "1", "true", "yes")
+FALL_DIRS = ("fall", "falls")
+EXTRACT_VERSION = 2       # bump when extraction changes keypoints (2: landmarker reset per clip)
+EARLY_TOLERANCE_S = 1.0   # onset labels are hand-marked to about a second
+
+# Worker state — one landmarker per process, created on the first cache miss
+_worker = {"pose": None, "settings": None}
+
+
+# ── Clips and labels ─────────────────────────────────────────────────
+def find_clips(paths, manifest=None):
+    clips = []
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, newline="") as f:
+            for row in csv.DictReader(f):
+                fall_start = row.get("fall_start")
+                clips.append({
+                    "path": os.path.join(base, row["clip"]),
+                    "label": row["label"].strip().lower() in FALL_LABELS,
+                    "fall_start": float(fall_start) if fall_start else None,
+                })
+        return clips
+    for root in paths:
+        if os.path.isfile(root):
+            candidates = [root]
+        else:
+            candidates = [os.path.join(d, name) for d, _, names in os.walk(root) for name in names]
+        for path in sorted(candidates):
+            if path.lower().endswith(VIDEO_EXTS):
+                parent = os.path.basename(os.path.dirname(os.path.abspath(path))).lower()
+                clips.append({"path": path, "label": parent in FALL_DIRS, "fall_start": None})
+    return clips
+
+
+# ── Keypoint cache ───────────────────────────────────────────────────
+def hash_file(path, chunk=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def model_version(tier, input_scale, stride):
+    """Everything that changes extracted keypoints, and nothing else."""
+    from pose_estimator import ensure_model
+    model_hash = hash_file(ensure_model(tier))[:12]
+    return f"{tier}-{model_hash}-scale{input_scale:g}-stride{stride}-x{EXTRACT_VERSION}"
+
+
+def cache_path(cache_dir, version, clip_hash):
+    return os.path.join(cache_dir, version, f"{clip_hash}.json.gz")
+
+
+def load_cached(path):
+    try:
+        with gzip.open(path, "rt") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached(path, record):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp, "wt") as f:
+        json.dump(record, f, separators=(",", ":"))
+    os.replace(tmp, path)   # atomic, so a crashed worker never leaves half a file
+
+
+# ── Pipeline ─────────────────────────────────────────────────────────
+def extract_keypoints(path, pose, stride):
+    import cv2
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"could not open {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step_ms = max(1, int(round(1000.0 * stride / fps)))
+    # Tracking state must not leak in from whichever clip this worker ran
+    # before, or cached keypoints would depend on pool scheduling
+    pose.reset()
+    frames, width, height, index = [], 0, 0, 0
+    while True:
+        if index % stride:
+            # grab() skips decoding frames we are not going to use
+            if not cap.grab():
+                break
+        else:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            height, width = frame.shape[:2]
+            # An inference error fails the clip; it must not be cached as "no person"
+            keypoints = pose.get_keypoints(frame, step_ms=step_ms, raise_errors=True)
+            if keypoints is not None:
+                keypoints = {k: [round(v, 2) for v in kp] for k, kp in keypoints.items()}
+            frames.append([round(index / fps, 3), keypoints])
+        index += 1
+    cap.release()
+    return {"fps": fps, "width": width, "height": height, "stride": stride, "frames": frames}
+
+
+def first_fall(record):
+    """Run FallDetector over cached keypoints; time of the first FALL or None.
+    The detector is told the stride so its frame-count constants keep
+    covering the same stretch of the clip."""
+    from fall_detector import FallDetector
+    detector = FallDetector(record["stride"])
+    for t, keypoints in record["frames"]:
+        if detector.process_frame(keypoints, record["height"]) == "FALL":
+            return t
+    return None
+
+
+def init_worker(settings, quiet):
+    _worker["settings"] = settings
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+
+def evaluate_clip(clip):
+    settings = _worker["settings"]
+    row = {"clip": clip["path"], "label": clip["label"], "error": None}
+    try:
+        clip_hash = hash_file(clip["path"])
+        path = cache_path(settings["cache_dir"], settings["version"], clip_hash)
+        record = None if settings["refresh"] else load_cached(path)
+        row["cached"] = record is not None
+
+        t0 = time.perf_counter()
+        if record is None:
+            if _worker["pose"] is None:
+                from pose_estimator import PoseEstimator
+                _worker["pose"] = PoseEstimator(settings["tier"])
+                _worker["pose"].input_scale = settings["input_scale"]
+            record = extract_keypoints(clip["path"], _worker["pose"], settings["stride"])
+            save_cached(path, record)
+        t1 = time.perf_counter()
+        detected_at = first_fall(record)
+        t2 = time.perf_counter()
+    except Exception as e:
+        row["error"] = str(e)
+        return row
+
+    row.update({
+        "predicted": detected_at is not None,
+        "detect_s": detected_at,
+        "latency_s": None,
+        "frames": len(record["frames"]),
+        "fps": record["fps"],
+        "duration_s": record["frames"][-1][0] if record["frames"] else 0.0,
+        "extract_s": round(t1 - t0, 3),
+        "detect_ms": round((t2 - t1) * 1000, 2),
+    })
+    if not clip["label"]:
+        row["outcome"] = "FP" if row["predicted"] else "TN"
+    elif detected_at is None:
+        row["outcome"] = "FN"
+    elif clip["fall_start"] is not None and detected_at < clip["fall_start"] - EARLY_TOLERANCE_S:
+        row["outcome"] = "EARLY"
+    else:
+        row["outcome"] = "TP"
+        if clip["fall_start"] is not None:
+            row["latency_s"] = round(max(0.0, detected_at - clip["fall_start"]), 3)
+    return row
+
+
+# ── Reports ──────────────────────────────────────────────────────────
+def summarize(rows, version, wall_s):
+    scored = [r for r in rows if not r["error"]]
+    counts = {k: sum(1 for r in scored if r["outcome"] == k) for k in ("TP", "FP", "FN", "TN", "EARLY")}
+    # An early detection is both a false alarm and a missed fall
+    tp, fp, fn = counts["TP"], counts["FP"] + counts["EARLY"], counts["FN"] + counts["EARLY"]
+    precision = tp / (tp + fp) if tp + fp else None
+    recall = tp / (tp + fn) if tp + fn else None
+    if precision is None or recall is None:
+        f1 = None
+    else:
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    latencies = np.array([r["latency_s"] for r in scored if r["latency_s"] is not None])
+    return {
+        "model_version": version,
+        "clips": len(rows),
+        "errors": len(rows) - len(scored),
+        "cache_hits": sum(1 for r in scored if r["cached"]),
+        **counts,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "latency_mean_s": float(latencies.mean()) if latencies.size else None,
+        "latency_median_s": float(np.median(latencies)) if latencies.size else None,
+        "latency_p95_s": float(np.percentile(latencies, 95)) if latencies.size else None,
+        "latency_clips": int(latencies.size),
+        "clip_fps": sorted({round(r["fps"], 2) for r in scored}),
+        "video_seconds": round(sum(r["duration_s"] for r in scored), 1),
+        "wall_seconds": round(wall_s, 1),
+    }
+
+
+def write_reports(report_dir, rows, summary):
+    os.makedirs(report_dir, exist_ok=True)
+    fields = ["clip", "label", "predicted", "outcome", "detect_s", "latency_s", "frames", "fps",
+              "duration_s", "cached", "extract_s", "detect_ms", "error"]
+    with open(os.path.join(report_dir, "per_clip.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(sorted(rows, key=lambda r: r["clip"]))
+    with open(os.path.join(report_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+
+def fmt(value, spec=".3f"):
+    return "n/a" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch offline fall-detection evaluation")
+    parser.add_argument("paths", nargs="*", help="clip files or directories (searched recursively)")
+    parser.add_argument("--manifest", help="CSV with clip,label[,fall_start] instead of directory labels")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--stride", type=int, default=1, help="run the pipeline on every Nth frame")
+    parser.add_argument("--model-tier", default="full", choices=("full", "lite"))
+    parser.add_argument("--input-scale", type=float, default=1.0, help="downscale frames before inference")
+    parser.add_argument("--cache-dir", default=".eval_cache")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached keypoints and re-run inference")
+    parser.add_argument("--report-dir", default="eval_reports")
+    parser.add_argument("--verbose", action="store_true", help="keep worker output")
+    args = parser.parse_args()
+
+    clips = find_clips(args.paths, args.manifest)
+    if not clips:
+        parser.error("no clips found")
+    version = model_version(args.model_tier, args.input_scale, args.stride)
+    settings = {"cache_dir": args.cache_dir, "version": version, "tier": args.model_tier,
+                "input_scale": args.input_scale, "stride": args.stride, "refresh": args.refresh}
+    print(f"[Eval] {len(clips)} clips, {args.workers} workers, model {version}")
+
+    rows = []
+    started = time.perf_counter()
+    # spawn: MediaPipe does not survive fork reliably
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(args.workers, initializer=init_worker, initargs=(settings, not args.verbose)) as pool:
+        for row in pool.imap_unordered(evaluate_clip, clips):
+            rows.append(row)
+            if row["error"]:
+                print(f"[Eval] {len(rows)}/{len(clips)} ERROR {row['clip']}: {row['error']}")
+            else:
+                print(f"[Eval] {len(rows)}/{len(clips)} {row['outcome']} {row['clip']}"
+                      f"{' (cached)' if row['cached'] else ''}")
+
+    summary = summarize(rows, version, time.perf_counter() - started)
+    write_reports(args.report_dir, rows, summary)
+    print(f"[Eval] TP {summary['TP']}  FP {summary['FP']}  FN {summary['FN']}  TN {summary['TN']}  early {summary['EARLY']}"
+          f"  errors {summary['errors']}  cache hits {summary['cache_hits']}/{len(rows)}")
+    print(f"[Eval] precision {fmt(summary['precision'])}  recall {fmt(summary['recall'])}  f1 {fmt(summary['f1'])}")
+    print(f"[Eval] latency mean {fmt(summary['latency_mean_s'], '.2f')}s  median {fmt(summary['latency_median_s'], '.2f')}s"
+          f"  p95 {fmt(summary['latency_p95_s'], '.2f')}s  ({summary['latency_clips']} clips with a labelled onset)")
+    if len(summary["clip_fps"]) > 1:
+        # FallDetector counts processed frames, scaled for --stride but not for the source frame rate
+        print(f"[Eval] Note: clips were recorded at {summary['clip_fps']} fps; FallDetector's frame-count "
+              f"windows cover different wall-clock time at each, and may differ from the deployed camera")
+    print(f"[Eval] {summary['video_seconds']}s of video in {summary['wall_seconds']}s. Reports in {args.report_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,50 @@
+import math
 import numpy as np
+from collections import deque
 from config import (
     BODY_ANGLE_THRESHOLD, STILLNESS_FRAMES, STILLNESS_VARIANCE,
     FALL_HIP_Y_MAX, STAND_HIP_Y_MIN, RESET_COOLDOWN_FRAMES
 )
 
 
+DROP_PER_FRAME = 0.08   # hip drop (fraction of frame height) between consecutive frames
+
+
 class FallDetector:
-    def __init__(self):
+    """Frame-count constants in config.py assume every camera frame is
+    processed. With stride N (only every Nth frame reaches process_frame)
+    they are scaled so they still cover the same wall-clock time."""
+
+    def __init__(self, stride=1):
         self.angle_flagged = False
         self.drop_flagged = False
         self.fall_confirmed = False
-        self.stillness_buffer = []
+        self.stillness_buffer = deque()
         self.prev_hip_y = None
         self.cooldown_counter = 0
+        self.stride = None
+        self.set_stride(stride)
         print("[GuardianEye] Fall detector initialized.")
 
+    def set_stride(self, stride):
+        stride = max(1, int(stride))
+        if stride == self.stride:
+            return
+        self.stride = stride
+        self.stillness_frames = max(2, math.ceil(STILLNESS_FRAMES / self.stride))
+        self.cooldown_frames = math.ceil(RESET_COOLDOWN_FRAMES / self.stride)
+        self.drop_threshold = DROP_PER_FRAME * self.stride
+        self.stillness_buffer = deque(self.stillness_buffer, maxlen=self.stillness_frames)
+        # The next hip delta would span a different interval
+        self.prev_hip_y = None
+
     def reset(self):
         self.angle_flagged = False
         self.drop_flagged = False
         self.fall_confirmed = False
-        self.stillness_buffer = []
+        self.stillness_buffer.clear()
         self.prev_hip_y = None
-        self.cooldown_counter = RESET_COOLDOWN_FRAMES
+        self.cooldown_counter = self.cooldown_frames
         print("[GuardianEye] Fall detector reset.")
 
     def get_body_angle(self, keypoints):
@@ -46,7 +69,7 @@ class FallDetector:
         hip_y = (keypoints["left_hip"][1] + keypoints["right_hip"][1]) / 2
         if self.prev_hip_y is not None:
             delta = self.prev_hip_y - hip_y  # negative = moving up in pixel space = dropping
-            if delta > frame_height * 0.08:  # dropped more than 8% of frame height in one frame
+            if delta > frame_height * self.drop_threshold:  # 8% of frame height per camera frame
                 self.prev_hip_y = hip_y
                 return True
         self.prev_hip_y = hip_y
@@ -58,10 +81,8 @@ class FallDetector:
             keypoints["right_hip"][0], keypoints["right_hip"][1],
             keypoints["left_shoulder"][0], keypoints["left_shoulder"][1],
         ])
-        self.stillness_buffer.append(pos)
-        if len(self.stillness_buffer) > STILLNESS_FRAMES:
-            self.stillness_buffer.pop(0)
-        if len(self.stillness_buffer) < STILLNESS_FRAMES:
+        self.stillness_buffer.append(pos)   # maxlen drops the oldest
+        if len(self.stillness_buffer) < self.stillness_frames:
             return False
         variance = np.var(np.array(self.stillness_buffer), axis=0).mean()
         return variance < STILLNESS_VARIANCE
@@ -113,7 +134,7 @@ class FallDetector:
                 else:
                     self.angle_flagged = False
                     self.drop_flagged = False
-                    self.stillness_buffer = []
+                    self.stillness_buffer.clear()
             return "ALERT"
 
         return "CLEAR"
@@ -0,0 +1,173 @@
+import glob
+import threading
+from timer_service import TimerService
+from config import (
+    GOVERNOR_INTERVAL, GOVERNOR_TEMP_HIGH, GOVERNOR_TEMP_LOW,
+    GOVERNOR_LOAD_HIGH, GOVERNOR_LOAD_LOW, GOVERNOR_TARGET_FPS,
+    GOVERNOR_LAG_HIGH, GOVERNOR_LAG_LOW,
+    GOVERNOR_DOWN_SAMPLES, GOVERNOR_UP_SAMPLES, GOVERNOR_SETTLE_SECONDS,
+)
+
+# Quality ladder, best first. Viewer streaming is degraded before anything
+# that affects fall detection; inference stride is the very last resort.
+#   input_scale      — fraction of camera resolution fed to the pose model
+#   inference_stride — run pose + fall detection on every Nth frame
+#   jpeg_quality     — dashboard stream JPEG quality
+#   stream_fps       — max dashboard stream frame rate
+#   model_tier       — PoseEstimator model ("full" or "lite")
+QUALITY_LADDER = [
+    {"input_scale": 1.0,  "inference_stride": 1, "jpeg_quality": 60, "stream_fps": 15, "model_tier": "full"},
+    {"input_scale": 1.0,  "inference_stride": 1, "jpeg_quality": 45, "stream_fps": 8,  "model_tier": "full"},
+    {"input_scale": 1.0,  "inference_stride": 1, "jpeg_quality": 35, "stream_fps": 4,  "model_tier": "full"},
+    {"input_scale": 0.75, "inference_stride": 1, "jpeg_quality": 35, "stream_fps": 4,  "model_tier": "full"},
+    {"input_scale": 0.5,  "inference_stride": 1, "jpeg_quality": 30, "stream_fps": 2,  "model_tier": "full"},
+    {"input_scale": 0.5,  "inference_stride": 1, "jpeg_quality": 30, "stream_fps": 2,  "model_tier": "lite"},
+    {"input_scale": 0.5,  "inference_stride": 2, "jpeg_quality": 30, "stream_fps": 1,  "model_tier": "lite"},
+]
+
+# Stages that count toward frame-processing lag. Camera reads are excluded
+# since they block on the sensor's own frame rate.
+PROCESSING_STAGES = ("inference", "detection", "render", "stream")
+
+EWMA_ALPHA = 0.2
+
+
+def read_cpu_temp():
+    """Hottest thermal zone in °C, or None when sysfs is unavailable."""
+    temps = []
+    for path in glob.glob("/sys/class/thermal/thermal_zone*/temp"):
+        try:
+            with open(path) as f:
+                temps.append(int(f.read().strip()) / 1000.0)
+        except (OSError, ValueError):
+            continue
+    return max(temps) if temps else None
+
+
+def read_cpu_times():
+    """(busy, total) jiffies summed over all CPUs from /proc/stat, or None.
+    Unlike the 1-minute load average this reflects a step within one sample."""
+    try:
+        with open("/proc/stat") as f:
+            fields = [int(v) for v in f.readline().split()[1:9]]
+    except (OSError, ValueError):
+        return None
+    if len(fields) < 5:
+        return None
+    total = sum(fields)
+    return total - fields[3] - fields[4], total   # minus idle and iowait
+
+
+class PerformanceGovernor:
+    """Samples temperature, load and the loop's stage timings on its own
+    timer thread and walks QUALITY_LADDER with hysteresis: a couple of
+    pressured samples step down, a long run of relaxed ones steps up.
+    Temperature lags a step by tens of seconds, so for GOVERNOR_SETTLE_SECONDS
+    after each step it neither counts as pressure nor allows a step up.
+
+    The main loop reads `level` each frame and applies it; settings that
+    touch the landmarker must stay on the thread that owns it."""
+
+    def __init__(self, timers=None, on_change=None):
+        self.owns_timers = timers is None
+        self.timers = timers or TimerService(name="Governor")
+        self.on_change = on_change
+        self.index = 0
+        self.stage_times = {}
+        self.lock = threading.Lock()
+        self.pressure_count = 0
+        self.relaxed_count = 0
+        self.last_sample = {}
+        self.last_step_at = float("-inf")
+        self.prev_cpu_times = None
+        self.sample_timer = None
+
+    @property
+    def level(self):
+        return QUALITY_LADDER[self.index]
+
+    def start(self):
+        self.timers.start()
+        self.sample_timer = self.timers.schedule_every(GOVERNOR_INTERVAL, self.sample)
+        print("[Governor] Started.")
+        return self
+
+    def stop(self):
+        self.timers.cancel(self.sample_timer)
+        if self.owns_timers:
+            self.timers.stop()
+
+    def record_stage(self, name, seconds, stride=1):
+        """stride: the stage runs on every Nth frame only, so its cost is
+        spread over N frames of budget."""
+        seconds /= stride
+        with self.lock:
+            prev = self.stage_times.get(name)
+            self.stage_times[name] = seconds if prev is None else prev + EWMA_ALPHA * (seconds - prev)
+
+    def processing_lag(self):
+        """Smoothed per-frame processing time as a fraction of the budget."""
+        with self.lock:
+            busy = sum(self.stage_times.get(s, 0.0) for s in PROCESSING_STAGES)
+        return busy * GOVERNOR_TARGET_FPS
+
+    def cpu_load(self):
+        """Busy fraction of all CPUs since the previous call, or None."""
+        times = read_cpu_times()
+        prev, self.prev_cpu_times = self.prev_cpu_times, times
+        if times is None or prev is None or times[1] <= prev[1]:
+            return None
+        return (times[0] - prev[0]) / (times[1] - prev[1])
+
+    def sample(self):
+        temp = read_cpu_temp()
+        load = self.cpu_load()
+        lag = self.processing_lag()
+        settling = self.timers.now() - self.last_step_at < GOVERNOR_SETTLE_SECONDS
+        self.last_sample = {"temp": temp, "load": load, "lag": lag, "level": self.index, "settling": settling}
+
+        pressured = (
+            (temp is not None and temp >= GOVERNOR_TEMP_HIGH and not settling)
+            or (load is not None and load >= GOVERNOR_LOAD_HIGH)
+            or lag >= GOVERNOR_LAG_HIGH
+        )
+        relaxed = (
+            not settling
+            and (temp is None or temp <= GOVERNOR_TEMP_LOW)
+            and (load is None or load <= GOVERNOR_LOAD_LOW)
+            and lag <= GOVERNOR_LAG_LOW
+        )
+
+        if pressured:
+            self.pressure_count += 1
+            self.relaxed_count = 0
+            if self.pressure_count >= GOVERNOR_DOWN_SAMPLES:
+                self.step(+1, temp, load, lag)
+        elif relaxed:
+            self.relaxed_count += 1
+            self.pressure_count = 0
+            if self.relaxed_count >= GOVERNOR_UP_SAMPLES:
+                self.step(-1, temp, load, lag)
+        else:
+            # Between thresholds — hold the current level
+            self.pressure_count = 0
+            self.relaxed_count = 0
+
+    def step(self, direction, temp=None, load=None, lag=None):
+        new_index = min(max(self.index + direction, 0), len(QUALITY_LADDER) - 1)
+        self.pressure_count = 0
+        self.relaxed_count = 0
+        if new_index == self.index:
+            return
+        self.index = new_index
+        self.last_step_at = self.timers.now()
+        # Timings measured at the old level no longer apply
+        with self.lock:
+            self.stage_times.clear()
+        temp_str = f"{temp:.0f}C" if temp is not None else "n/a"
+        load_str = f"{load:.2f}" if load is not None else "n/a"
+        lag_str = f"{lag:.2f}" if lag is not None else "n/a"
+        print(f"[Governor] Quality {'down' if direction > 0 else 'up'} to level {self.index} "
+              f"(temp {temp_str}, load {load_str}, lag {lag_str}x): {self.level}")
+        if self.on_change:
+            self.on_change(self.level)
@@ -0,0 +1,283 @@
+"""GuardianEye fan-in hub.
+
+Devices (hub_client.HubReporter) keep a Socket.IO connection on the
+/devices namespace and push compact status deltas. The hub keeps the
+latest state per device plus an event index in memory, and serves:
+  - one aggregated Socket.IO feed on the default namespace
+    ('hub_snapshot' on connect, then batched 'hub_update' deltas)
+  - one consolidated notification stream ('hub_notification' + ntfy)
+
+    python hub.py --port 5100
+"""
+
+import argparse
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from flask import Flask, jsonify, request
+from flask_socketio import SocketIO, emit
+from flask_cors import CORS
+from notifier import send_notification
+from timer_service import TimerService
+from config import (
+    FLASK_HOST, HUB_PORT, HUB_FLUSH_HZ, HUB_NOTIFY_WINDOW,
+    HUB_EVENT_LOG_MAX, HUB_DEVICE_EVENTS_MAX, HUB_NTFY_URL,
+)
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = 'guardianeye-hub'
+CORS(app, origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+
+EVENT_LABELS = {'fall': 'Fall detected', 'emergency': 'Emergency escalated', 'clear': 'Alert resolved'}
+EVENT_RANK = {'clear': 0, 'fall': 1, 'emergency': 2}
+NTFY_PRIORITY = {'clear': 'default', 'fall': 'high', 'emergency': 'urgent'}
+NTFY_TAGS = {'clear': 'white_check_mark', 'fall': 'warning,sos', 'emergency': 'rotating_light,sos'}
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _valid_device_id(device_id):
+    return isinstance(device_id, str) and device_id != ''
+
+def _valid_event(ev):
+    return (isinstance(ev, dict) and _is_int(ev.get('i')) and ev['i'] > 0
+            and ev.get('k') in EVENT_LABELS
+            and isinstance(ev.get('ts'), (int, float)) and not isinstance(ev['ts'], bool))
+
+def _newest(events, limit):
+    # list(...)[-0:] would be the whole list
+    return list(events)[-limit:] if limit > 0 else []
+
+
+class DeviceRegistry:
+    """Latest state per device plus a bounded event index.
+
+    Deltas are applied as they arrive; the dashboard feed and the
+    notification stream drain what changed since their last flush, so
+    several deltas from one device between flushes collapse into one."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.devices = {}         # device id -> latest state
+        self.sessions = {}        # socket sid -> device id
+        self.cursors = {}         # device id -> [boot, last seq, event ids seen, id floor]
+        self.events = deque(maxlen=HUB_EVENT_LOG_MAX)   # newest last
+        self.device_events = {}   # device id -> deque of that device's events
+        self.dirty = set()
+        self.unsent_events = deque(maxlen=HUB_EVENT_LOG_MAX)
+        self.unnotified = deque(maxlen=HUB_EVENT_LOG_MAX)
+        self.stats = {'deltas': 0, 'duplicates': 0, 'events': 0, 'invalid': 0}
+
+    def _device(self, device_id):
+        dev = self.devices.get(device_id)
+        if dev is None:
+            dev = {'id': device_id, 'room': device_id, 'status': None, 'countdown': None,
+                   'online': False, 'last_seen': None}
+            self.devices[device_id] = dev
+            self.device_events[device_id] = deque(maxlen=HUB_DEVICE_EVENTS_MAX)
+        return dev
+
+    def hello(self, sid, data):
+        if not isinstance(data, dict) or not _valid_device_id(data.get('d')):
+            with self.lock:
+                self.stats['invalid'] += 1
+            return False
+        device_id, boot, room = data['d'], data.get('b'), data.get('room')
+        with self.lock:
+            dev = self._device(device_id)
+            dev['room'] = room if isinstance(room, str) and room else device_id
+            dev['online'] = True
+            dev['last_seen'] = time.time()
+            self.sessions[sid] = device_id
+            cursor = self.cursors.get(device_id)
+            if cursor is None or cursor[0] != boot:
+                # New boot — its sequence numbers start over
+                self.cursors[device_id] = [boot, 0, set(), 0]
+            self.dirty.add(device_id)
+        return True
+
+    def apply(self, delta):
+        if not isinstance(delta, dict):
+            return False
+        device_id, boot, seq = delta.get('d'), delta.get('b'), delta.get('s', 0)
+        if not _valid_device_id(device_id) or not _is_int(seq):
+            with self.lock:
+                self.stats['invalid'] += 1
+            return False
+        with self.lock:
+            self.stats['deltas'] += 1
+            cursor = self.cursors.get(device_id)
+            if cursor is None or cursor[0] != boot:
+                cursor = self.cursors[device_id] = [boot, 0, set(), 0]
+            dev = self._device(device_id)
+            fresh = seq > cursor[1]
+            if fresh:
+                cursor[1] = seq
+                dev['status'] = delta.get('st')
+                dev['countdown'] = delta.get('cd')
+            else:
+                # Out-of-order or resent: its state is stale, but its events
+                # may not have arrived any other way
+                self.stats['duplicates'] += 1
+            dev['online'] = True
+            dev['last_seen'] = time.time()
+            self.dirty.add(device_id)
+
+            seen = cursor[2]
+            for ev in delta.get('ev') or ():
+                if not _valid_event(ev):
+                    # Dropped here so it can't break a notification digest later
+                    self.stats['invalid'] += 1
+                    continue
+                if ev['i'] <= cursor[3] or ev['i'] in seen:
+                    continue
+                seen.add(ev['i'])
+                event = {'id': f"{device_id}:{boot}:{ev['i']}", 'device': device_id,
+                         'room': dev['room'], 'kind': ev['k'], 'ts': ev['ts']}
+                self.events.append(event)
+                self.device_events[device_id].append(event)
+                self.unsent_events.append(event)
+                self.unnotified.append(event)
+                self.stats['events'] += 1
+            if len(seen) > 2 * HUB_DEVICE_EVENTS_MAX:
+                # Devices resend only recent events, so old ids collapse into a floor
+                cursor[3] = max(seen) - HUB_DEVICE_EVENTS_MAX
+                cursor[2] = {i for i in seen if i > cursor[3]}
+        return fresh
+
+    def disconnect(self, sid):
+        with self.lock:
+            device_id = self.sessions.pop(sid, None)
+            if device_id and device_id not in self.sessions.values():
+                self.devices[device_id]['online'] = False
+                self.dirty.add(device_id)
+
+    def drain_updates(self):
+        with self.lock:
+            devices = [dict(self.devices[d]) for d in self.dirty]
+            events = list(self.unsent_events)
+            self.dirty.clear()
+            self.unsent_events.clear()
+        return devices, events
+
+    def drain_notifications(self):
+        with self.lock:
+            events = list(self.unnotified)
+            self.unnotified.clear()
+        return events
+
+    def snapshot(self, event_limit=50):
+        with self.lock:
+            return {
+                'devices': [dict(d) for d in self.devices.values()],
+                'events': _newest(self.events, event_limit),
+            }
+
+    def events_for(self, device_id=None, limit=50):
+        with self.lock:
+            source = self.events if device_id is None else self.device_events.get(device_id, ())
+            return _newest(source, limit)
+
+
+
+registry = DeviceRegistry()
+hub_settings = {'push_notifications': True}
+
+
+# ── Device side (/devices) ───────────────────────────────────────────
+@socketio.on('hello', namespace='/devices')
+def on_device_hello(data):
+    registry.hello(request.sid, data)
+
+@socketio.on('delta', namespace='/devices')
+def on_device_delta(delta):
+    registry.apply(delta)
+
+@socketio.on('disconnect', namespace='/devices')
+def on_device_disconnect(*args):
+    registry.disconnect(request.sid)
+
+
+# ── Dashboard side (/) ───────────────────────────────────────────────
+@socketio.on('connect')
+def on_dashboard_connect():
+    emit('hub_snapshot', registry.snapshot())
+
+@app.route('/api/devices')
+def api_devices():
+    return jsonify(registry.snapshot(event_limit=0)['devices'])
+
+@app.route('/api/events')
+def api_events():
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    limit = max(0, min(limit, HUB_EVENT_LOG_MAX))
+    return jsonify(registry.events_for(request.args.get('device'), limit))
+
+@app.route('/api/stats')
+def api_stats():
+    with registry.lock:
+        online = sum(1 for d in registry.devices.values() if d['online'])
+        return jsonify(dict(registry.stats, devices=len(registry.devices), online=online))
+
+
+# ── Periodic flushes ─────────────────────────────────────────────────
+def flush_updates():
+    devices, events = registry.drain_updates()
+    if devices or events:
+        socketio.emit('hub_update', {'devices': devices, 'events': events, 'ts': time.time()})
+
+def flush_notifications():
+    events = registry.drain_notifications()
+    if not events:
+        return
+    # Only the latest event per device matters, e.g. fall then clear → clear
+    latest = {}
+    for event in events:
+        latest[event['device']] = event
+    events = sorted(latest.values(), key=lambda e: -EVENT_RANK[e['kind']])
+    top = events[0]['kind']
+
+    lines = [f"{e['room']}: {EVENT_LABELS[e['kind']]} at {datetime.fromtimestamp(e['ts']).strftime('%H:%M:%S')}"
+             for e in events]
+    if len(events) == 1:
+        title = f"GuardianEye Hub - {EVENT_LABELS[top]}"
+    else:
+        title = f"GuardianEye Hub - {len(events)} rooms need attention" if top != 'clear' \
+            else f"GuardianEye Hub - {len(events)} alerts resolved"
+    message = "\n".join(lines)
+
+    socketio.emit('hub_notification', {'title': title, 'message': message, 'priority': NTFY_PRIORITY[top],
+                                       'events': events})
+    if hub_settings['push_notifications']:
+        threading.Thread(target=send_notification, daemon=True,
+                         args=(title, message, NTFY_PRIORITY[top], NTFY_TAGS[top], HUB_NTFY_URL)).start()
+    else:
+        print(f"[Hub] {title}: {message.replace(chr(10), ' | ')}")
+
+
+def run_hub(host=FLASK_HOST, port=HUB_PORT):
+    timers = TimerService(name="HubFlush").start()
+    timers.schedule_every(1.0 / HUB_FLUSH_HZ, flush_updates)
+    timers.schedule_every(HUB_NOTIFY_WINDOW, flush_notifications)
+    print(f"[Hub] Listening on {host}:{port}")
+    socketio.run(app, host=host, port=port, debug=False, allow_unsafe_werkzeug=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GuardianEye fan-in hub")
+    parser.add_argument("--host", default=FLASK_HOST)
+    parser.add_argument("--port", type=int, default=HUB_PORT)
+    parser.add_argument("--no-notify", action="store_true", help="log digests instead of sending ntfy pushes")
+    args = parser.parse_args()
+    hub_settings['push_notifications'] = not args.no_notify
+    run_hub(args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+import math
+import threading
+import time
+import uuid
+import socketio
+from timer_service import TimerService
+from config import HUB_URL, DEVICE_ID, DEVICE_ROOM, HUB_REPORT_HZ
+
+ALERT_STATES = ("COUNTDOWN", "STOOD_UP", "FALL", "EMERGENCY")
+PENDING_EVENTS_MAX = 50   # events held while the hub is unreachable
+
+
+class HubReporter:
+    """Pushes compact status deltas from one device to the fan-in hub.
+
+    Status and countdown are coalesced and sent at most HUB_REPORT_HZ
+    times a second, and only when something changed. Fall / emergency /
+    clear events are inferred from status transitions and sent at once.
+    Each delta carries a boot id and sequence number so the hub can drop
+    duplicates after a reconnect.
+
+    Delta keys: d=device, b=boot, s=seq, st=status, cd=countdown seconds,
+    ev=[{i=event id, k=kind, ts=unix time}].
+    """
+
+    def __init__(self, url=HUB_URL, device_id=DEVICE_ID, room=DEVICE_ROOM, timers=None):
+        self.url = url
+        self.device_id = device_id
+        self.room = room
+        self.boot = uuid.uuid4().hex[:8]
+        self.timers = timers or TimerService(name="HubReporter")
+        self.lock = threading.Lock()
+        # Held from seq assignment through emit so deltas leave in seq order
+        self.send_lock = threading.Lock()
+        self.seq = 0
+        self.event_id = 0
+        self.status = None
+        self.countdown = None
+        self.dirty = False
+        self.pending_events = []
+        self.flush_timer = None
+        self.sio = socketio.Client(reconnection=True, reconnection_delay_max=30)
+        self.sio.on("connect", self._on_connect, namespace="/devices")
+
+    def start(self):
+        self.timers.start()
+        self.flush_timer = self.timers.schedule_every(1.0 / HUB_REPORT_HZ, self.flush)
+        # Connect off the caller's thread; socketio.Client keeps retrying
+        threading.Thread(target=self._connect, name=f"HubConnect-{self.device_id}", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.timers.cancel(self.flush_timer)
+        try:
+            self.sio.disconnect()
+        except Exception:
+            pass
+
+    def _connect(self):
+        while True:
+            try:
+                self.sio.connect(self.url, namespaces=["/devices"], wait_timeout=10)
+                return
+            except Exception as e:
+                print(f"[Hub] {self.device_id} could not reach hub: {e}")
+                time.sleep(5)
+
+    def _on_connect(self):
+        self.sio.emit("hello", {"d": self.device_id, "b": self.boot, "room": self.room}, namespace="/devices")
+        # Resend the full current state after every (re)connect
+        with self.lock:
+            self.dirty = True
+        self.flush()
+
+    # ── Hooks (server.py listeners) ──────────────────────────────────
+    def on_dashboard_event(self, kind, value):
+        if kind == "status":
+            self.report_status(value)
+        elif kind == "countdown":
+            self.report_countdown(value)
+
+    def report_status(self, status):
+        event = None
+        with self.lock:
+            if status == self.status:
+                return
+            prev = self.status
+            if status == "EMERGENCY":
+                event = "emergency"
+            elif status == "COUNTDOWN" and prev not in ALERT_STATES:
+                event = "fall"
+            elif status == "CLEAR" and prev in ALERT_STATES:
+                event = "clear"
+            self.status = status
+            self.dirty = True
+            if event:
+                self.event_id += 1
+                self.pending_events.append({"i": self.event_id, "k": event, "ts": time.time()})
+                del self.pending_events[:-PENDING_EVENTS_MAX]
+        if event:
+            # Don't hold alerts back until the next periodic flush
+            self.flush()
+
+    def report_countdown(self, seconds):
+        shown = None if seconds is None else math.ceil(seconds)
+        with self.lock:
+            if shown != self.countdown:
+                self.countdown = shown
+                self.dirty = True
+
+    def flush(self):
+        with self.send_lock:
+            with self.lock:
+                if not self.dirty or not self.sio.connected:
+                    return
+                self.seq += 1
+                delta = {"d": self.device_id, "b": self.boot, "s": self.seq,
+                         "st": self.status, "cd": self.countdown}
+                if self.pending_events:
+                    delta["ev"] = self.pending_events
+                events = self.pending_events
+                self.pending_events = []
+                self.dirty = False
+            try:
+                self.sio.emit("delta", delta, namespace="/devices")
+            except Exception as e:
+                print(f"[Hub] {self.device_id} delta send failed: {e}")
+                with self.lock:
+                    # Keep events for the next flush; state is resent anyway
+                    self.pending_events = (events + self.pending_events)[-PENDING_EVENTS_MAX:]
+                    self.dirty = True
@@ -0,0 +1,135 @@
+"""Spawn N fake GuardianEye devices against a local hub for load testing.
+
+Each fake device is a real HubReporter with its own Socket.IO connection;
+one driver thread walks every device through random fall / countdown /
+escalation / clear episodes. With --watch a dashboard client counts
+aggregated updates and measures event latency through the hub.
+
+    python hub.py --no-notify &
+    python hub_simulator.py --devices 200 --duration 120 --watch
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import socketio
+from hub_client import HubReporter
+from timer_service import TimerService
+
+TICK_SECONDS = 0.5
+
+
+class FakeDevice:
+    def __init__(self, index, url, timers, rng):
+        self.rng = rng
+        self.reporter = HubReporter(url=url, device_id=f"sim-{index:04d}",
+                                    room=f"Room {index + 1}", timers=timers)
+        self.status = "CLEAR"
+        self.countdown = None
+
+    def step(self, fall_rate):
+        rng = self.rng
+        if self.status in ("CLEAR", "ALERT"):
+            if rng.random() < fall_rate:
+                self.status, self.countdown = "COUNTDOWN", 30.0
+            else:
+                self.status = "ALERT" if rng.random() < 0.02 else "CLEAR"
+        elif self.status in ("COUNTDOWN", "STOOD_UP"):
+            self.countdown -= TICK_SECONDS
+            if self.countdown <= 0:
+                self.status, self.countdown = "EMERGENCY", None
+            elif rng.random() < 0.05:
+                self.status, self.countdown = "CLEAR", None
+            elif self.status == "COUNTDOWN" and rng.random() < 0.05:
+                self.status, self.countdown = "STOOD_UP", self.countdown + 30
+        elif self.status in ("EMERGENCY", "FALL"):
+            # Caregiver arrives and resets after a while
+            self.status = "FALL" if rng.random() > 0.05 else "CLEAR"
+        self.reporter.report_status(self.status)
+        self.reporter.report_countdown(self.countdown)
+
+
+class Watcher:
+    """Dashboard client counting hub_update traffic and event latency."""
+
+    def __init__(self, url):
+        self.updates = 0
+        self.device_updates = 0
+        self.notifications = 0
+        self.latencies = []
+        self.sio = socketio.Client()
+        self.sio.on("hub_update", self._on_update)
+        self.sio.on("hub_notification", self._on_notification)
+        self.sio.connect(url)
+
+    def _on_update(self, data):
+        now = time.time()
+        self.updates += 1
+        self.device_updates += len(data["devices"])
+        self.latencies.extend(now - e["ts"] for e in data["events"])
+        del self.latencies[:-10000]
+
+    def _on_notification(self, data):
+        self.notifications += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake GuardianEye devices for hub load testing")
+    parser.add_argument("--hub", default="http://localhost:5100")
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to run")
+    parser.add_argument("--fall-rate", type=float, default=0.002, help="fall probability per device per tick")
+    parser.add_argument("--watch", action="store_true", help="also connect as a dashboard and report throughput")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    # Progress shows up even when output is piped or redirected to a file
+    sys.stdout.reconfigure(line_buffering=True)
+
+    rng = random.Random(args.seed)
+    timers = TimerService(name="SimReporters").start()
+    devices = [FakeDevice(i, args.hub, timers, random.Random(rng.random())) for i in range(args.devices)]
+    for dev in devices:
+        dev.reporter.start()
+    watcher = Watcher(args.hub) if args.watch else None
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and not all(d.reporter.sio.connected for d in devices):
+        time.sleep(0.2)
+    connected = sum(d.reporter.sio.connected for d in devices)
+    print(f"[Sim] {connected}/{len(devices)} devices connected to {args.hub}")
+
+    started = time.monotonic()
+    next_report = started + 10
+    while time.monotonic() - started < args.duration:
+        tick_start = time.monotonic()
+        for dev in devices:
+            dev.step(args.fall_rate)
+        if watcher and time.monotonic() >= next_report:
+            next_report += 10
+            lat = sorted(watcher.latencies) or [0.0]
+            print(f"[Sim] {time.monotonic() - started:5.0f}s  hub_update {watcher.updates}  "
+                  f"device rows {watcher.device_updates}  notifications {watcher.notifications}  "
+                  f"event latency p50 {lat[len(lat) // 2] * 1000:.0f}ms p95 {lat[int(len(lat) * 0.95)] * 1000:.0f}ms")
+        time.sleep(max(0.0, TICK_SECONDS - (time.monotonic() - tick_start)))
+
+    sent = sum(d.reporter.seq for d in devices)
+    print(f"[Sim] Done: {sent} deltas sent by {len(devices)} devices in {args.duration:.0f}s")
+    # Each disconnect waits for the websocket close handshake (seconds),
+    # so close every client at once instead of one after another
+    closers = [dev.reporter.stop for dev in devices]
+    if watcher:
+        closers.append(watcher.sio.disconnect)
+    threads = [threading.Thread(target=fn, daemon=True) for fn in closers]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 10
+    for t in threads:
+        t.join(max(0.0, deadline - time.monotonic()))
+    timers.stop()
+    print(f"[Sim] Disconnected {sum(not t.is_alive() for t in threads)}/{len(threads)} clients")
+
+
+if __name__ == "__main__":
+    main()
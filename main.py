@@ -1,12 +1,14 @@
 import cv2
 import numpy as np
 import time
-from pose_estimator import PoseEstimator
+from pose_estimator import PoseEstimator, ensure_model
 from fall_detector import FallDetector
 from notifier import send_fall_alert, send_clear_alert
 from mcu_comm import connect, send_command, disconnect
-from config import CAMERA_INDEX
-from server import socketio, emit_status, emit_frame, emit_countdown, emit_keypoint, run_server
+from config import CAMERA_INDEX, HUB_URL
+from server import socketio, emit_status, emit_frame, emit_countdown, emit_keypoint, run_server, set_stream_quality, listeners
+from timer_service import TimerService
+from governor import PerformanceGovernor, QUALITY_LADDER
 import threading
 
 INITIAL_COUNTDOWN = 30   # seconds before escalation
@@ -76,6 +78,118 @@ def draw_overlay(frame, status, keypoints=None, countdown=None):
     return frame
 
 
+class AlertStateMachine:
+    """CLEAR / ALERT / COUNTDOWN / STOOD_UP / FALL transitions driven by
+    FallDetector output. Expiry is handled by escalate() on the timer
+    thread, so a stalled camera cannot delay the emergency call.
+    push_alerts=False skips ntfy pushes (soak runs)."""
+
+    def __init__(self, timers, push_alerts=True):
+        self.timers = timers
+        self.push_alerts = push_alerts
+        self.lock = threading.Lock()
+        self.status = "CLEAR"
+        self.notification_sent = False
+        self.escalation_timer = None   # fires when the countdown runs out
+        self.tick_timer = None         # pushes countdown seconds to the dashboard
+        self.stood_up = False          # did person stand up after the fall?
+
+    def escalate(self):
+        with self.lock:
+            if self.status not in ("COUNTDOWN", "STOOD_UP"):
+                return
+            print("[GuardianEye] COUNTDOWN EXPIRED — ESCALATING TO EMERGENCY")
+            self.status = "FALL"
+            self.timers.cancel(self.tick_timer)
+            self.tick_timer = None
+        send_command("FALL")
+        emit_status("EMERGENCY")
+        emit_countdown(None)
+
+    def tick(self):
+        remaining = self.timers.remaining(self.escalation_timer)
+        if remaining is not None:
+            emit_countdown(remaining)
+
+    def start_countdown(self):
+        self.escalation_timer = self.timers.schedule(INITIAL_COUNTDOWN, self.escalate)
+        self.tick_timer = self.timers.schedule_every(1.0, self.tick, first_delay=0)
+
+    def stop_countdown(self):
+        self.timers.cancel(self.escalation_timer)
+        self.timers.cancel(self.tick_timer)
+        self.escalation_timer = None
+        self.tick_timer = None
+
+    def update(self, det_status):
+        """Apply one detector result; returns (status, countdown seconds or None)."""
+        send_alert = False
+        with self.lock:
+            if self.status in ("CLEAR", "ALERT"):
+                if det_status == "FALL":
+                    # New fall detected
+                    self.status = "COUNTDOWN"
+                    self.stood_up = False
+                    self.start_countdown()
+                    if not self.notification_sent:
+                        send_alert = True
+                        self.notification_sent = True
+                    print(f"[GuardianEye] FALL — countdown started ({INITIAL_COUNTDOWN}s)")
+
+                elif det_status == "ALERT":
+                    self.status = "ALERT"
+
+                else:
+                    self.status = "CLEAR"
+
+            elif self.status == "COUNTDOWN":
+                if det_status == "CLEAR" and not self.stood_up:
+                    # Person stood up for the first time — add bonus
+                    self.stood_up = True
+                    self.timers.shift(self.escalation_timer, STANDUP_BONUS)
+                    remaining = self.timers.remaining(self.escalation_timer) or 0
+                    self.status = "STOOD_UP"
+                    print(f"[GuardianEye] Person stood up — +{STANDUP_BONUS}s added ({remaining:.0f}s remaining)")
+
+            elif self.status == "STOOD_UP":
+                if det_status == "FALL":
+                    # Fell again after standing — subtract penalty
+                    self.stood_up = False
+                    self.timers.shift(self.escalation_timer, -REFALL_PENALTY)
+                    remaining = self.timers.remaining(self.escalation_timer) or 0
+                    self.status = "COUNTDOWN"
+                    print(f"[GuardianEye] Person fell again — -{REFALL_PENALTY}s ({remaining:.0f}s remaining)")
+
+            elif self.status == "FALL":
+                # Latched — only manual R press resets
+                pass
+
+            countdown_display = None
+            if self.status in ("COUNTDOWN", "STOOD_UP"):
+                countdown_display = self.timers.remaining(self.escalation_timer)
+            status = self.status
+
+        # Network and serial I/O stay outside the lock so escalate() never waits on them
+        if send_alert:
+            if self.push_alerts:
+                send_fall_alert()
+            send_command("FALL")
+        return status, countdown_display
+
+    def cancel(self):
+        """Manual reset (R key): clear the alert and any running countdown."""
+        with self.lock:
+            self.stop_countdown()
+            self.status = "CLEAR"
+            self.notification_sent = False
+            self.stood_up = False
+        if self.push_alerts:
+            send_clear_alert()
+        send_command("CLEAR")
+        emit_status("CLEAR")
+        emit_countdown(None)
+
+
 def main():
     print("[GuardianEye] Starting system...")
     connect()
@@ -83,8 +197,22 @@ def main():
     server_thread = threading.Thread(target=run_server, daemon=True)
     server_thread.start()
 
+    hub = None
+    if HUB_URL:
+        from hub_client import HubReporter
+        hub = HubReporter().start()
+        listeners.append(hub.on_dashboard_event)
+
+    # Fetch every model the governor may switch to now, not mid-stream
+    for tier in sorted({level["model_tier"] for level in QUALITY_LADDER}):
+        try:
+            ensure_model(tier)
+        except Exception as e:
+            print(f"[GuardianEye] WARNING — Could not download {tier} pose model: {e}")
+
     pose = PoseEstimator()
     detector = FallDetector()
+    governor = PerformanceGovernor().start()
 
     cap = cv2.VideoCapture(CAMERA_INDEX)
     if not cap.isOpened():
@@ -94,11 +222,13 @@ def main():
     print("[GuardianEye] Camera opened. Running live detection.")
     print("[GuardianEye] Press Q to quit, R to cancel alert.")
 
-    # State machine
-    current_status   = "CLEAR"
-    notification_sent = False
-    countdown_end    = None   # time.time() when escalation fires
-    stood_up         = False  # did person stand up after the fall?
+    timers = TimerService(name="Escalation").start()
+    alerts = AlertStateMachine(timers)
+
+    applied_level = None
+    frame_index   = 0
+    keypoints     = None
+    det_status    = "CLEAR"
 
     while True:
         ret, frame = cap.read()
@@ -106,106 +236,51 @@ def main():
             print("[GuardianEye] ERROR — Could not read frame.")
             break
 
+        # ── APPLY GOVERNOR LEVEL ──────────────────────────────────────
+        # The landmarker is owned by this thread, so changes land here
+        level = governor.level
+        if level is not applied_level:
+            try:
+                pose.set_model_tier(level["model_tier"], download=False)
+            except Exception as e:
+                print(f"[GuardianEye] Staying on {pose.model_tier} pose model: {e}")
+            pose.input_scale = level["input_scale"]
+            detector.set_stride(level["inference_stride"])
+            set_stream_quality(level["jpeg_quality"], level["stream_fps"])
+            applied_level = level
+
         h, w = frame.shape[:2]
-        keypoints = pose.get_keypoints(frame)
-        if keypoints and "nose" in keypoints:
-            nose_x_pct = keypoints["nose"][0] / w
-            nose_y_pct = keypoints["nose"][1] / h
-            emit_keypoint(nose_x_pct, nose_y_pct)
-        det_status = detector.process_frame(keypoints, h)
+        frame_index += 1
+        # Skipped frames reuse the last decision; every transition in
+        # AlertStateMachine.update is idempotent for a repeated det_status
+        if frame_index % level["inference_stride"] == 0:
+            t0 = time.perf_counter()
+            keypoints = pose.get_keypoints(frame)
+            t1 = time.perf_counter()
+            if keypoints and "nose" in keypoints:
+                nose_x_pct = keypoints["nose"][0] / w
+                nose_y_pct = keypoints["nose"][1] / h
+                emit_keypoint(nose_x_pct, nose_y_pct)
+            det_status = detector.process_frame(keypoints, h)
+            governor.record_stage("inference", t1 - t0, level["inference_stride"])
+            governor.record_stage("detection", time.perf_counter() - t1, level["inference_stride"])
 
         # ── TRANSITION LOGIC ──────────────────────────────────────────
-
-        if current_status == "CLEAR":
-            if det_status == "FALL":
-                # New fall detected
-                current_status = "COUNTDOWN"
-                stood_up = False
-                countdown_end = time.time() + INITIAL_COUNTDOWN
-                if not notification_sent:
-                    send_fall_alert()
-                    send_command("FALL")
-                    notification_sent = True
-                print(f"[GuardianEye] FALL — countdown started ({INITIAL_COUNTDOWN}s)")
-
-            elif det_status == "ALERT":
-                current_status = "ALERT"
-
-            else:
-                current_status = "CLEAR"
-
-        elif current_status == "ALERT":
-            if det_status == "FALL":
-                current_status = "COUNTDOWN"
-                stood_up = False
-                countdown_end = time.time() + INITIAL_COUNTDOWN
-                if not notification_sent:
-                    send_fall_alert()
-                    send_command("FALL")
-                    notification_sent = True
-                print(f"[GuardianEye] FALL — countdown started ({INITIAL_COUNTDOWN}s)")
-            elif det_status == "CLEAR":
-                current_status = "CLEAR"
-
-        elif current_status == "COUNTDOWN":
-            remaining = countdown_end - time.time()
-
-            if det_status == "CLEAR" and not stood_up:
-                # Person stood up for the first time — add bonus
-                stood_up = True
-                countdown_end += STANDUP_BONUS
-                remaining = countdown_end - time.time()
-                current_status = "STOOD_UP"
-                print(f"[GuardianEye] Person stood up — +{STANDUP_BONUS}s added ({remaining:.0f}s remaining)")
-
-            elif remaining <= 0:
-                # Timer expired — escalate
-                print("[GuardianEye] COUNTDOWN EXPIRED — ESCALATING TO EMERGENCY")
-                current_status = "FALL"
-                send_command("FALL")
-                emit_status("EMERGENCY")
-
-        elif current_status == "STOOD_UP":
-            remaining = countdown_end - time.time()
-
-            if det_status == "FALL":
-                # Fell again after standing — subtract penalty
-                stood_up = False
-                countdown_end -= REFALL_PENALTY
-                remaining = countdown_end - time.time()
-                current_status = "COUNTDOWN"
-                print(f"[GuardianEye] Person fell again — -{REFALL_PENALTY}s ({remaining:.0f}s remaining)")
-
-            elif det_status == "CLEAR" and remaining > 0:
-                # Still standing, still counting down
-                pass
-
-            elif remaining <= 0:
-                print("[GuardianEye] COUNTDOWN EXPIRED — ESCALATING TO EMERGENCY")
-                current_status = "FALL"
-                send_command("FALL")
-                emit_status("EMERGENCY")
-
-        elif current_status == "FALL":
-            # Latched — only manual R press resets
-            pass
-
-        # ── COUNTDOWN VALUE TO DISPLAY ────────────────────────────────
-        countdown_display = None
-        if current_status in ("COUNTDOWN", "STOOD_UP") and countdown_end:
-            countdown_display = max(0, countdown_end - time.time())
+        status_snapshot, countdown_display = alerts.update(det_status)
 
         # ── EMIT TO DASHBOARD ─────────────────────────────────────────
-        emit_status(current_status)
-        if countdown_display is not None:
-            emit_countdown(countdown_display)
-        else:
-            emit_countdown(None)
+        # Countdown seconds are pushed by tick() on the timer thread
+        emit_status(status_snapshot)
 
         # ── DRAW & SHOW ───────────────────────────────────────────────
-        frame = draw_overlay(frame, current_status, keypoints, countdown_display)
+        t0 = time.perf_counter()
+        frame = draw_overlay(frame, status_snapshot, keypoints, countdown_display)
+        t1 = time.perf_counter()
         emit_frame(frame)
+        t2 = time.perf_counter()
         cv2.imshow("GuardianEye — Live Detection", frame)
+        governor.record_stage("render", (t1 - t0) + (time.perf_counter() - t2))
+        governor.record_stage("stream", t2 - t1)
 
         key = cv2.waitKey(1) & 0xFF
         if key == ord("q"):
@@ -214,15 +289,12 @@ def main():
         elif key == ord("r"):
             print("[GuardianEye] Manual cancel — alert cleared.")
             detector.reset()
-            current_status = "CLEAR"
-            notification_sent = False
-            countdown_end = None
-            stood_up = False
-            send_clear_alert()
-            send_command("CLEAR")
-            emit_status("CLEAR")
-            emit_countdown(None)
+            alerts.cancel()
 
+    if hub:
+        hub.stop()
+    governor.stop()
+    timers.stop()
     cap.release()
     disconnect()
     cv2.destroyAllWindows()
@@ -38,4 +38,20 @@ def send_clear_alert():
         )
         print("[GuardianEye] Clear notification sent.")
     except Exception as e:
-        print(f"[GuardianEye] Clear notification error: {e}")
\ No newline at end of file
+        print(f"[GuardianEye] Clear notification error: {e}")
+
+def send_notification(title, message, priority="default", tags="", url=NTFY_URL):
+    try:
+        requests.post(
+            url,
+            data=message.encode("utf-8"),
+            headers={
+                "Title": title,
+                "Priority": priority,
+                "Tags": tags
+            },
+            timeout=5
+        )
+        print(f"[GuardianEye] Notification sent: {title}")
+    except Exception as e:
+        print(f"[GuardianEye] Notification error: {e}")
@@ -6,21 +6,55 @@ import os
 MODEL_PATH = "pose_landmarker_full.task"
 MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/latest/pose_landmarker_full.task"
 
+# Model tiers the performance governor can switch between
+MODEL_TIERS = {
+    "full": (MODEL_PATH, MODEL_URL),
+    "lite": ("pose_landmarker_lite.task",
+             "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task"),
+}
+
+def ensure_model(tier="full", download=True):
+    """Download the model for `tier` if it is not present; returns its path.
+    With download=False a missing model raises instead."""
+    model_path, model_url = MODEL_TIERS[tier]
+    if not os.path.exists(model_path):
+        if not download:
+            raise FileNotFoundError(f"pose model {model_path} ({tier}) has not been downloaded")
+        print(f"[GuardianEye] Downloading pose model ({tier})...")
+        urllib.request.urlretrieve(model_url, model_path)
+        print("[GuardianEye] Model downloaded.")
+    return model_path
+
 class PoseEstimator:
-    def __init__(self):
-        print("[GuardianEye] Loading MediaPipe Pose model...")
+    def __init__(self, model_tier="full"):
+        self.input_scale = 1.0   # frames are downscaled by this before inference
+        self.small_buf = None    # reused resize / RGB buffers, reallocated only on shape change
+        self.rgb_buf = None
+        self.frame_timestamp_ms = 0
+        self.model_tier = None
+        self.landmarker = None
+        self.set_model_tier(model_tier)
 
-        # Download model if not present
-        if not os.path.exists(MODEL_PATH):
-            print("[GuardianEye] Downloading pose model (~30MB)...")
-            urllib.request.urlretrieve(MODEL_URL, MODEL_PATH)
-            print("[GuardianEye] Model downloaded.")
+    def set_model_tier(self, tier, download=True):
+        if tier == self.model_tier:
+            return
+        self._load(tier, download)
+
+    def reset(self):
+        """Fresh landmarker for the current tier: drops VIDEO-mode tracking
+        state (the previous frame's ROI) so the next stream starts clean."""
+        self._load(self.model_tier, download=False)
+        self.frame_timestamp_ms = 0
+
+    def _load(self, tier, download):
+        print(f"[GuardianEye] Loading MediaPipe Pose model ({tier})...")
+        model_path = ensure_model(tier, download)
 
         from mediapipe.tasks import python as mp_python
         from mediapipe.tasks.python import vision as mp_vision
         from mediapipe.tasks.python.vision import RunningMode
 
-        base_options = mp_python.BaseOptions(model_asset_path=MODEL_PATH)
+        base_options = mp_python.BaseOptions(model_asset_path=model_path)
         options = mp_vision.PoseLandmarkerOptions(
             base_options=base_options,
             running_mode=RunningMode.VIDEO,
@@ -28,18 +62,32 @@ class PoseEstimator:
             min_pose_presence_confidence=0.5,
             min_tracking_confidence=0.5,
         )
-        self.landmarker = mp_vision.PoseLandmarker.create_from_options(options)
-        self.frame_timestamp_ms = 0
+        landmarker = mp_vision.PoseLandmarker.create_from_options(options)
+        if self.landmarker is not None:
+            self.landmarker.close()
+        self.landmarker = landmarker
+        self.model_tier = tier
         print("[GuardianEye] Model loaded successfully.")
 
-    def get_keypoints(self, frame):
+    def get_keypoints(self, frame, step_ms=33, raise_errors=False):
+        """step_ms advances the VIDEO-mode timestamp (~30fps by default;
+        larger when frames are skipped). Errors are logged and read as
+        "no person" unless raise_errors is set (offline evaluation)."""
         try:
             import mediapipe as mp
             h, w = frame.shape[:2]
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Landmarks are normalized, so scaling back uses the original w/h
+            if self.input_scale < 1.0:
+                size = (int(w * self.input_scale), int(h * self.input_scale))
+                if self.small_buf is None or self.small_buf.shape[:2] != (size[1], size[0]):
+                    self.small_buf = np.empty((size[1], size[0], 3), dtype=frame.dtype)
+                frame = cv2.resize(frame, size, dst=self.small_buf, interpolation=cv2.INTER_AREA)
+            if self.rgb_buf is None or self.rgb_buf.shape != frame.shape:
+                self.rgb_buf = np.empty_like(frame)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb_buf)
             mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
 
-            self.frame_timestamp_ms += 33  # ~30fps
+            self.frame_timestamp_ms += step_ms
             result = self.landmarker.detect_for_video(mp_image, self.frame_timestamp_ms)
 
             if not result.pose_landmarks or len(result.pose_landmarks) == 0:
@@ -70,6 +118,8 @@ class PoseEstimator:
             return keypoints
 
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"[PoseEstimator] Error during inference: {e}")
             return None
 
@@ -0,0 +1,115 @@
+"""Escalation scenarios for AlertStateMachine on a frozen virtual clock.
+
+Each scenario feeds detector results into the state machine and steps
+the clock with TimerService.advance(), so a full 30 s countdown (plus
+stand-up bonus and re-fall penalty) plays out in milliseconds and every
+deadline fires at exactly its due time. No camera, model or MCU needed.
+
+    python scenario_check.py
+"""
+
+import sys
+
+from main import AlertStateMachine, INITIAL_COUNTDOWN, STANDUP_BONUS, REFALL_PENALTY
+from server import listeners
+from timer_service import TimerService, VirtualClock
+
+failures = []
+
+
+def expect(label, got, want):
+    ok = got == want
+    print(f"[Check] {'ok  ' if ok else 'FAIL'} {label}: {got!r}" + ("" if ok else f" (expected {want!r})"))
+    if not ok:
+        failures.append(label)
+
+
+def setup():
+    timers = TimerService(VirtualClock(speed=0), name="ScenarioTimers").start()
+    return timers, AlertStateMachine(timers, push_alerts=False)
+
+
+def remaining(timers, alerts):
+    left = timers.remaining(alerts.escalation_timer)
+    return None if left is None else round(left, 3)
+
+
+def scenario_expiry():
+    print("[Check] Fall, nobody responds")
+    timers, alerts = setup()
+    status, countdown = alerts.update("FALL")
+    expect("status after fall", status, "COUNTDOWN")
+    expect("countdown after fall", countdown, INITIAL_COUNTDOWN)
+    timers.advance(INITIAL_COUNTDOWN - 0.1)
+    expect("status just before expiry", alerts.status, "COUNTDOWN")
+    timers.advance(0.1)
+    expect("status at expiry", alerts.status, "FALL")
+    expect("escalation timer spent", remaining(timers, alerts), None)
+    timers.stop()
+
+
+def scenario_stand_and_refall():
+    print("[Check] Fall, stand up, fall again")
+    timers, alerts = setup()
+    alerts.update("FALL")
+    timers.advance(10)
+    status, countdown = alerts.update("CLEAR")
+    expect("status after standing", status, "STOOD_UP")
+    expect("countdown after stand-up bonus", round(countdown, 3), INITIAL_COUNTDOWN - 10 + STANDUP_BONUS)
+    alerts.update("CLEAR")
+    expect("bonus applied once", remaining(timers, alerts), INITIAL_COUNTDOWN - 10 + STANDUP_BONUS)
+    timers.advance(5)
+    status, countdown = alerts.update("FALL")
+    expect("status after re-fall", status, "COUNTDOWN")
+    left = INITIAL_COUNTDOWN - 15 + STANDUP_BONUS - REFALL_PENALTY
+    expect("countdown after re-fall penalty", round(countdown, 3), left)
+    timers.advance(left - 0.1)
+    expect("status just before expiry", alerts.status, "COUNTDOWN")
+    timers.advance(0.1)
+    expect("status at expiry", alerts.status, "FALL")
+    timers.stop()
+
+
+def scenario_cancel():
+    print("[Check] Fall, caregiver cancels")
+    timers, alerts = setup()
+    alerts.update("FALL")
+    timers.advance(5)
+    alerts.cancel()
+    timers.advance(INITIAL_COUNTDOWN * 3)
+    expect("status after cancel", alerts.status, "CLEAR")
+    status, _ = alerts.update("FALL")
+    expect("next fall starts a new countdown", status, "COUNTDOWN")
+    timers.stop()
+
+
+def scenario_ticks():
+    print("[Check] Countdown ticks reach the dashboard once per second")
+    timers, alerts = setup()
+    shown = []
+
+    def listener(kind, value):
+        if kind == "countdown" and value is not None:
+            shown.append(value)
+
+    listeners.append(listener)
+    try:
+        alerts.update("FALL")
+        timers.advance(INITIAL_COUNTDOWN + 5)
+    finally:
+        listeners.remove(listener)
+    expect("ticks", [round(v, 3) for v in shown], [float(INITIAL_COUNTDOWN - i) for i in range(INITIAL_COUNTDOWN)])
+    timers.stop()
+
+
+def main():
+    scenario_expiry()
+    scenario_stand_and_refall()
+    scenario_cancel()
+    scenario_ticks()
+    print(f"[Check] {'FAIL: ' + ', '.join(failures) if failures else 'All scenarios passed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
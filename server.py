@@ -1,7 +1,10 @@
 import cv2
 import base64
+import time
+from collections import deque
 from datetime import datetime
-from flask import Flask
+from itertools import islice
+from flask import Flask, request
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 
@@ -10,58 +13,97 @@ app.config['SECRET_KEY'] = 'guardianeye-secret'
 CORS(app, origins="*")
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
+ALERT_LOG_MAX = 50    # entries kept in memory
+ALERT_LOG_SENT = 20   # entries sent to the dashboard
+
 state = {
     'status': 'CLEAR',
-    'alert_log': [],
+    'alert_log': deque(maxlen=ALERT_LOG_MAX),   # newest first
+    'recent_alerts': [],                        # first ALERT_LOG_SENT entries, rebuilt on change
     'frame_b64': None,
     'countdown': None,
     'nose_pos': None,
 }
 
+# Dashboard stream quality — lowered by the performance governor under load
+stream_settings = {
+    'jpeg_quality': 60,
+    'max_fps': 15,
+    'last_sent': float('-inf'),
+}
+
+# Connected dashboard sids — frames are only encoded while someone is watching
+viewers = set()
+
+# Callbacks fn(kind, value) for 'status' / 'countdown' updates (e.g. the hub reporter)
+listeners = []
+
+def set_stream_quality(jpeg_quality, max_fps):
+    stream_settings['jpeg_quality'] = jpeg_quality
+    stream_settings['max_fps'] = max_fps
+
+def log_alert(message, entry_type):
+    state['alert_log'].appendleft({
+        'time': datetime.now().strftime('%H:%M:%S'),
+        'message': message,
+        'type': entry_type
+    })
+    state['recent_alerts'] = list(islice(state['alert_log'], ALERT_LOG_SENT))
+
 def emit_status(status):
+    # Called every frame — only log on an actual status change
+    changed = status != state['status']
     state['status'] = status
-    if status in ('FALL', 'EMERGENCY'):
-        entry = {
-            'time': datetime.now().strftime('%H:%M:%S'),
-            'message': 'Fall detected' if status == 'FALL' else 'Emergency escalated',
-            'type': 'fall'
-        }
-        state['alert_log'].insert(0, entry)
-        if len(state['alert_log']) > 50:
-            state['alert_log'].pop()
-    elif status == 'CLEAR' and len(state['alert_log']) > 0 and state['alert_log'][0]['type'] == 'fall':
-        entry = {
-            'time': datetime.now().strftime('%H:%M:%S'),
-            'message': 'Alert resolved',
-            'type': 'clear'
-        }
-        state['alert_log'].insert(0, entry)
+    if changed and status in ('FALL', 'EMERGENCY'):
+        log_alert('Fall detected' if status == 'FALL' else 'Emergency escalated', 'fall')
+    elif changed and status == 'CLEAR' and state['alert_log'] and state['alert_log'][0]['type'] == 'fall':
+        log_alert('Alert resolved', 'clear')
     socketio.emit('status_update', {
         'status': status,
-        'alert_log': state['alert_log'][:20]
+        'alert_log': state['recent_alerts']
     })
+    for fn in listeners:
+        fn('status', status)
 
 def emit_countdown(seconds):
     state['countdown'] = seconds
     socketio.emit('countdown', {'seconds': seconds})
+    for fn in listeners:
+        fn('countdown', seconds)
 
 def emit_keypoint(nose_x_pct, nose_y_pct):
     state['nose_pos'] = {'x': nose_x_pct, 'y': nose_y_pct}
     socketio.emit('keypoint', {'x': nose_x_pct, 'y': nose_y_pct})
 
-def emit_frame(frame):
-    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 60])
+def emit_frame(frame, now=None):
+    # imencode and b64encode each allocate their output per call, so the
+    # way to save those allocations is not to encode: skip frames above
+    # the stream rate limit, and all frames while nobody is watching.
+    # now: caller's clock in seconds (defaults to time.monotonic())
+    if not viewers:
+        return
+    if now is None:
+        now = time.monotonic()
+    if now - stream_settings['last_sent'] < 1.0 / stream_settings['max_fps']:
+        return
+    stream_settings['last_sent'] = now
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, stream_settings['jpeg_quality']])
     b64 = base64.b64encode(buffer).decode('utf-8')
     state['frame_b64'] = b64
     socketio.emit('frame', {'image': b64})
 
 @socketio.on('connect')
 def on_connect():
-    emit('status_update', {'status': state['status'], 'alert_log': state['alert_log'][:20]})
+    viewers.add(request.sid)
+    emit('status_update', {'status': state['status'], 'alert_log': state['recent_alerts']})
     emit('countdown', {'seconds': state['countdown']})
     if state['frame_b64']:
         emit('frame', {'image': state['frame_b64']})
 
+@socketio.on('disconnect')
+def on_disconnect(*args):
+    viewers.discard(request.sid)
+
 def run_server():
     socketio.run(app, host='0.0.0.0', port=5000, debug=False, allow_unsafe_werkzeug=True)
 
@@ -0,0 +1,243 @@
+"""Accelerated soak test for the GuardianEye pipeline.
+
+Drives synthetic (or recorded) input through FallDetector, the alert state
+machine, the dashboard emitters and the overlay/JPEG path as fast as the
+CPU allows, on a virtual clock, so hours of operation pass in minutes.
+tracemalloc and RSS are sampled along the way and the run fails if memory
+keeps growing faster than --max-slope (Python heap) or --max-rss-slope
+(process RSS, which moves in allocator-sized steps and needs more slack).
+
+    python soak.py --hours 8
+    python soak.py --hours 2 --video recordings/bedroom.mp4
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from fall_detector import FallDetector
+from main import AlertStateMachine, draw_overlay
+from server import emit_status, emit_frame, emit_keypoint, set_stream_quality, viewers
+from timer_service import TimerService, VirtualClock
+
+FRAME_W, FRAME_H = 640, 480
+# RSS grows in allocator-sized steps (~1 MB arenas / mmap chunks); total
+# RSS growth below this is never called a leak, whatever its slope
+RSS_NOISE_KB = 2048
+
+# Standing pose relative to the point between the ankles (x right, y up)
+STANDING_POSE = {
+    "nose":           (0, 350),
+    "left_shoulder":  (-40, 290),
+    "right_shoulder": (40, 290),
+    "left_elbow":     (-50, 220),
+    "right_elbow":    (50, 220),
+    "left_hip":       (-30, 160),
+    "right_hip":      (30, 160),
+    "left_knee":      (-30, 80),
+    "right_knee":     (30, 80),
+    "left_ankle":     (-30, 0),
+    "right_ankle":    (30, 0),
+}
+
+
+class SyntheticPerson:
+    """Endless scenario of standing, falling, lying still and getting up.
+    Lying durations straddle the escalation countdown so every path of
+    the state machine gets exercised."""
+
+    def __init__(self, fps, seed=0):
+        self.fps = fps
+        self.rng = random.Random(seed)
+        self.x = FRAME_W / 2
+        self.frames = self._scenario()
+
+    def _scenario(self):
+        rng, fps = self.rng, self.fps
+        while True:
+            for _ in range(int(fps * rng.uniform(20, 120))):      # moving about
+                self.x = min(FRAME_W - 200, max(200, self.x + rng.gauss(0, 3)))
+                yield 0.0, 4.0
+            for i in range(int(fps * 0.5)):                       # falling
+                yield 90.0 * (i + 1) / (fps * 0.5), 2.0
+            for _ in range(int(fps * rng.choice([5, 20, 45, 120]))):  # lying
+                yield 90.0, 1.0
+            for i in range(int(fps * 1.5)):                       # getting up
+                yield 90.0 * (1 - (i + 1) / (fps * 1.5)), 3.0
+
+    def next_keypoints(self):
+        angle, noise = next(self.frames)
+        theta = math.radians(angle)
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        base_y = FRAME_H - 30
+        keypoints = {}
+        for name, (dx, dy) in STANDING_POSE.items():
+            # Rotate about the ankles, falling toward +x
+            rx = dx * cos_t + dy * sin_t
+            ry = -dx * sin_t + dy * cos_t
+            keypoints[name] = [
+                self.x + rx + self.rng.gauss(0, noise),
+                base_y - ry + self.rng.gauss(0, noise),
+                0.0, 0.99,
+            ]
+        return keypoints
+
+
+class VideoSource:
+    """Loops a recorded clip through PoseEstimator."""
+
+    def __init__(self, path):
+        from pose_estimator import PoseEstimator
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise SystemExit(f"[Soak] ERROR — Could not open {path}")
+        self.pose = PoseEstimator()
+
+    def next_frame(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return frame, self.pose.get_keypoints(frame)
+
+
+def read_rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    except ImportError:
+        return None
+
+
+def slope(points):
+    """Theil-Sen slope (median of pairwise slopes) of (x, y) points, or 0
+    with fewer than two. One allocator step between samples moves a
+    least-squares fit a lot; it barely moves the median."""
+    if len(points) < 2:
+        return 0.0
+    xs = np.array([p[0] for p in points])
+    ys = np.array([p[1] for p in points])
+    i, j = np.triu_indices(len(xs), k=1)
+    dx = xs[j] - xs[i]
+    keep = dx != 0
+    if not keep.any():
+        return 0.0
+    return float(np.median((ys[j] - ys[i])[keep] / dx[keep]))
+
+
+def run(args):
+    fps = args.fps
+    total_frames = int(args.hours * 3600 * fps)
+    sample_every = max(1, int(args.sample_minutes * 60 * fps))
+    warmup_frames = int(total_frames * args.warmup)
+
+    clock = VirtualClock(speed=0)
+    timers = TimerService(clock, name="SoakTimers").start()
+    alerts = AlertStateMachine(timers, push_alerts=False)
+    detector = FallDetector()
+    source = VideoSource(args.video) if args.video else SyntheticPerson(fps, args.seed)
+    blank = np.zeros((FRAME_H, FRAME_W, 3), dtype=np.uint8)
+    # 0 = JPEG-encode every frame, the worst case for allocation churn
+    set_stream_quality(60, args.stream_fps or float("inf"))
+    # No dashboard connects here; a placeholder viewer keeps emit_frame encoding
+    viewers.add("soak")
+
+    tracemalloc.start(10)
+    traced, rss = [], []
+    baseline = None
+    latched_since = None
+    escalations = 0
+    started = time.perf_counter()
+
+    print(f"[Soak] {args.hours:.1f}h simulated at {fps} fps ({total_frames} frames), "
+          f"{'video ' + args.video if args.video else 'synthetic input'}")
+
+    for i in range(total_frames):
+        if args.video:
+            frame, keypoints = source.next_frame()
+        else:
+            frame, keypoints = blank.copy(), source.next_keypoints()
+        h, w = frame.shape[:2]
+
+        if keypoints and "nose" in keypoints:
+            emit_keypoint(keypoints["nose"][0] / w, keypoints["nose"][1] / h)
+        det_status = detector.process_frame(keypoints, h)
+        status, countdown = alerts.update(det_status)
+        emit_status(status)
+        # Rate-limited on the virtual clock, like a real run at this fps
+        emit_frame(draw_overlay(frame, status, keypoints, countdown), now=timers.now())
+
+        # A caregiver presses R a minute after an escalation
+        if status == "FALL":
+            if latched_since is None:
+                latched_since = i
+                escalations += 1
+            elif i - latched_since > 60 * fps:
+                detector.reset()
+                alerts.cancel()
+                latched_since = None
+
+        # Fires every escalation timer due in this frame before the next one
+        timers.advance(1.0 / fps)
+
+        if i == warmup_frames:
+            baseline = tracemalloc.take_snapshot()
+        if i >= warmup_frames and (i - warmup_frames) % sample_every == 0:
+            sim_hours = i / fps / 3600
+            traced.append((sim_hours, tracemalloc.get_traced_memory()[0] / 1024))
+            rss_kb = read_rss_kb()
+            if rss_kb is not None:
+                rss.append((sim_hours, rss_kb))
+            elapsed = time.perf_counter() - started
+            print(f"[Soak] {sim_hours:6.2f}h  traced {traced[-1][1]:9.1f} KB  "
+                  f"rss {rss_kb or 0:9.1f} KB  ({(i + 1) / fps / max(elapsed, 1e-9):.0f}x real time)")
+
+    timers.stop()
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    traced_slope, rss_slope = slope(traced), slope(rss)
+    print(f"[Soak] Done in {time.perf_counter() - started:.0f}s, {escalations} escalations")
+    print(f"[Soak] Slope after warmup: traced {traced_slope:.1f} KB/h (limit {args.max_slope:.1f}), "
+          f"rss {rss_slope:.1f} KB/h (limit {args.max_rss_slope:.1f}, "
+          f"ignored below {RSS_NOISE_KB} KB total growth)")
+    if baseline is not None:
+        print("[Soak] Top allocation growth since warmup:")
+        for stat in final.compare_to(baseline, "lineno")[:10]:
+            print(f"    {stat}")
+
+    rss_growth = rss[-1][1] - rss[0][1] if len(rss) > 1 else 0.0
+    rss_failed = rss_slope > args.max_rss_slope and rss_growth > RSS_NOISE_KB
+    failed = traced_slope > args.max_slope or rss_failed
+    print("[Soak] FAIL — memory keeps growing." if failed else "[Soak] PASS")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GuardianEye accelerated soak test")
+    parser.add_argument("--hours", type=float, default=4.0, help="simulated hours to run")
+    parser.add_argument("--fps", type=int, default=15, help="simulated camera frame rate")
+    parser.add_argument("--video", help="loop a recorded clip through PoseEstimator instead of synthetic keypoints")
+    parser.add_argument("--stream-fps", type=float, default=0, help="dashboard stream rate limit (0 = encode every frame)")
+    parser.add_argument("--sample-minutes", type=float, default=10.0, help="simulated minutes between memory samples")
+    parser.add_argument("--warmup", type=float, default=0.1, help="fraction of the run excluded from the slope")
+    parser.add_argument("--max-slope", type=float, default=256.0, help="allowed traced-heap growth in KB per simulated hour")
+    parser.add_argument("--max-rss-slope", type=float, default=1024.0, help="allowed RSS growth in KB per simulated hour")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Refresh modules that the UnderWatch App Lab bundle mirrors from the repo root.
+
+App Lab imports only what lives under underwatch/python, so shared modules
+are copied there with a do-not-edit header. Run after editing a canonical
+copy; --check exits non-zero if a mirror is out of date.
+
+    python sync_underwatch.py
+    python sync_underwatch.py --check
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BUNDLE = os.path.join(ROOT, "underwatch", "python")
+MIRRORED = ("timer_service.py",)
+
+CANONICAL_HEADER = "# Canonical copy."
+MIRROR_HEADER = ("# Mirror of ../../{name}, written by sync_underwatch.py.\n"
+                 "# Do not edit here: change the canonical copy and re-run the script.\n\n")
+
+
+def mirror_text(name):
+    with open(os.path.join(ROOT, name)) as f:
+        text = f.read()
+    if text.startswith(CANONICAL_HEADER):
+        # Drop the canonical header block up to the first blank line
+        text = text.split("\n\n", 1)[1]
+    return MIRROR_HEADER.format(name=name) + text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync shared modules into the UnderWatch bundle")
+    parser.add_argument("--check", action="store_true", help="only report stale mirrors")
+    args = parser.parse_args()
+
+    stale = []
+    for name in MIRRORED:
+        target = os.path.join(BUNDLE, name)
+        text = mirror_text(name)
+        try:
+            with open(target) as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current == text:
+            continue
+        stale.append(name)
+        if not args.check:
+            with open(target, "w") as f:
+                f.write(text)
+            print(f"[Sync] Updated underwatch/python/{name}")
+    if args.check and stale:
+        print(f"[Sync] Out of date: {', '.join(stale)}. Run python sync_underwatch.py")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -34,23 +34,33 @@ let currentStatus = 'safe';
 const COUNTDOWN_MAX = 30;
 
 // ── Weighted Temporal Filter ──
+// Ring buffer with running sums: newest sample weighs WINDOW_SIZE, oldest 1.
+// Each push drops one unit of weight from every sample, so the weighted sum
+// updates as weighted - plain + n * value without rescanning the window.
 const WINDOW_SIZE    = 15;
 const FALL_THRESHOLD = 0.60;
-const detectionWindow = [];
+const detectionWindow = new Float64Array(WINDOW_SIZE);
+let windowHead   = 0;   // next slot to overwrite
+let windowCount  = 0;
+let plainSum     = 0;   // sum of values in the window
+let weightedSum  = 0;   // sum of weight * value
 
 function pushDetection(isFall, confidence) {
-    detectionWindow.push({ isFall, confidence });
-    if (detectionWindow.length > WINDOW_SIZE) detectionWindow.shift();
-
-    let weightedFall = 0;
-    let totalWeight  = 0;
-    detectionWindow.forEach((d, i) => {
-        const weight = i + 1;
-        totalWeight  += weight;
-        if (d.isFall) weightedFall += weight * d.confidence;
-    });
+    const value = isFall ? confidence : 0;
+
+    if (windowCount < WINDOW_SIZE) {
+        windowCount++;
+        weightedSum += windowCount * value;
+        plainSum    += value;
+    } else {
+        weightedSum += WINDOW_SIZE * value - plainSum;
+        plainSum    += value - detectionWindow[windowHead];
+    }
+    detectionWindow[windowHead] = value;
+    windowHead = (windowHead + 1) % WINDOW_SIZE;
 
-    return totalWeight > 0 ? weightedFall / totalWeight : 0;
+    const totalWeight = windowCount * (windowCount + 1) / 2;
+    return totalWeight > 0 ? weightedSum / totalWeight : 0;
 }
 
 // ── Status config ──
@@ -190,19 +200,25 @@ socket.on('alert_status', (statusText) => {
 
 socket.on('classifications', (message) => {
     try {
-        const detections = JSON.parse(message);
-        const fallDet   = detections.find(d => d.content?.toLowerCase() === 'fall');
-        const personDet = detections.find(d => d.content?.toLowerCase() === 'person');
+        // Backend batches detections: a list of per-detection entry lists
+        const batch = JSON.parse(message);
+        let weightedFall = false;
+        let personSeen   = false;
 
-        const isFall = !!fallDet;
-        const conf   = fallDet?.confidence ?? personDet?.confidence ?? 0.5;
+        batch.forEach((detections) => {
+            const fallDet   = detections.find(d => d.content?.toLowerCase() === 'fall');
+            const personDet = detections.find(d => d.content?.toLowerCase() === 'person');
 
-        const score = pushDetection(isFall, conf);
-        const weightedFall = score >= FALL_THRESHOLD;
+            const isFall = !!fallDet;
+            const conf   = fallDet?.confidence ?? personDet?.confidence ?? 0.5;
+
+            weightedFall = pushDetection(isFall, conf) >= FALL_THRESHOLD;
+            personSeen   = !!personDet;
+        });
 
         if (currentStatus !== 'emergency') {
             if (weightedFall)        setStatus('fall');
-            else if (personDet)      setStatus('safe');
+            else if (personSeen)     setStatus('safe');
         }
     } catch (e) { }
 });
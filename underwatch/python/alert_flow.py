@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: Copyright (C) ARDUINO SRL (http://www.arduino.cc)
+# SPDX-License-Identifier: MPL-2.0
+
+from datetime import datetime, UTC
+from timer_service import TimerService
+import math
+import threading
+
+COUNTDOWN_1_SECONDS      = 30
+COUNTDOWN_2_SECONDS      = 60
+STATUS_TICK_SECONDS      = 0.25   # countdown poll; alert_status only sent when the shown seconds change
+ADDITIONAL_TIME_ON_STAND = 30
+
+
+# ── Fall Alert Flow ───────────────────────────────────────────────────────────
+class FallAlertFlow:
+    """Escalation deadlines live on a TimerService, so notify_family and
+    call_emergency fire on time even if the detection stream stalls.
+    update() only reacts to what the camera sees (the stand-up bonus).
+    notify(title, message, priority, tags) pushes to the phone; None
+    skips pushes (scenario checks)."""
+
+    def __init__(self, ui, timers=None, notify=None):
+        self.ui = ui
+        self.timers = timers or TimerService(name="UnderWatchTimers").start()
+        self.notify = notify
+        self.lock = threading.RLock()
+        self.state = "IDLE"
+        self.start_time = None
+        self.stands_up_bonus_applied = False
+        self.deadline_timer = None
+        self.tick_timer = None
+        self.last_status = None
+
+    def _push(self, title, message, priority="default", tags=""):
+        if self.notify:
+            self.notify(title, message, priority, tags)
+
+    def remaining(self):
+        left = self.timers.remaining(self.deadline_timer)
+        return 0 if left is None else int(math.ceil(left))
+
+    def _start_stage(self, seconds, on_expire):
+        self.timers.cancel(self.deadline_timer)
+        self.timers.cancel(self.tick_timer)
+        self.deadline_timer = self.timers.schedule(seconds, on_expire)
+        self.tick_timer = self.timers.schedule_every(STATUS_TICK_SECONDS, self._tick, first_delay=0)
+
+    def _stop_timers(self):
+        self.timers.cancel(self.deadline_timer)
+        self.timers.cancel(self.tick_timer)
+        self.deadline_timer = None
+        self.tick_timer = None
+        self.last_status = None
+
+    def _tick(self):
+        with self.lock:
+            if self.state == "COUNTDOWN_1":
+                text = f"WARNING: Fall detected. Dismiss or notifying family in {self.remaining()}s"
+            elif self.state == "COUNTDOWN_2":
+                text = f"FAMILY NOTIFIED. Calling emergency in {self.remaining()}s"
+            else:
+                return
+            if text != self.last_status:
+                self.last_status = text
+                self.ui.send_message("alert_status", text)
+
+    def update(self, now, is_fall_detected, is_person_standing):
+        with self.lock:
+            if self.state == "COUNTDOWN_2" and is_person_standing and not self.stands_up_bonus_applied:
+                self.stands_up_bonus_applied = True
+                self.timers.shift(self.deadline_timer, ADDITIONAL_TIME_ON_STAND)
+                self.ui.send_message("alert_status", "Activity detected! Adding 30s to countdown.")
+
+    def trigger_fall(self, now):
+        with self.lock:
+            if self.state != "IDLE":
+                return
+            self.state = "COUNTDOWN_1"
+            self.start_time = now
+            self.stands_up_bonus_applied = False
+            self._start_stage(COUNTDOWN_1_SECONDS, self._on_countdown_1_expired)
+        self.ui.send_message("fall_alert", "LOCAL_WARNING_STARTED")
+        print("[UnderWatch] Fall confirmed — countdown started.")
+        self._push(
+            title    = "UnderWatch - Fall Detected",
+            message  = f"Fall detected at {now.strftime('%I:%M %p')}. Emergency in {COUNTDOWN_1_SECONDS}s unless dismissed.",
+            priority = "high", tags = "warning,sos"
+        )
+
+    def _on_countdown_1_expired(self):
+        with self.lock:
+            if self.state == "COUNTDOWN_1":
+                self.notify_family(datetime.now(UTC))
+
+    def _on_countdown_2_expired(self):
+        with self.lock:
+            if self.state == "COUNTDOWN_2":
+                self.call_emergency()
+
+    def notify_family(self, now):
+        with self.lock:
+            self.state = "COUNTDOWN_2"
+            self.start_time = now
+            self._start_stage(COUNTDOWN_2_SECONDS, self._on_countdown_2_expired)
+        self.ui.send_message("fall_alert", "FAMILY_NOTIFIED")
+        print("[UnderWatch] Family notified.")
+        self._push(
+            title    = "UnderWatch - Family Notified",
+            message  = f"Alert not dismissed. Family notified. Emergency in {COUNTDOWN_2_SECONDS}s.",
+            priority = "urgent", tags = "rotating_light,sos"
+        )
+
+    def call_emergency(self):
+        with self.lock:
+            self.state = "EMERGENCY"
+            self._stop_timers()
+        self.ui.send_message("fall_alert", "EMERGENCY_SERVICES_CALLED")
+        print("[UnderWatch] CRITICAL: Calling emergency services!")
+        self._push(
+            title    = "UnderWatch - EMERGENCY",
+            message  = "Emergency services contacted. Go to patient immediately.",
+            priority = "urgent", tags = "rotating_light,fire,sos"
+        )
+
+    def dismiss(self, now=None):
+        with self.lock:
+            if self.state == "IDLE":
+                return
+            self.state = "IDLE"
+            self._stop_timers()
+        self.ui.send_message("fall_alert", "ALERT_DISMISSED")
+        print("[UnderWatch] Alert dismissed.")
+        self._push(
+            title    = "UnderWatch - Alert Resolved",
+            message  = "Fall alert dismissed. Patient is okay.",
+            priority = "default", tags = "white_check_mark"
+        )
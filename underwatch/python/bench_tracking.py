@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: Copyright (C) ARDUINO SRL (http://www.arduino.cc)
+# SPDX-License-Identifier: MPL-2.0
+
+"""Feed synthetic classification streams through the streak tracker and the
+UI batcher at high rates.
+
+    python bench_tracking.py --rate 200 --seconds 600
+
+Compares against the previous per-detection implementation (list rebuild +
+re-sum, one JSON message per detection). Does not need the App Lab bricks.
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, UTC
+import argparse
+import io
+import json
+import random
+import time
+
+from tracking import (
+    FallStreakTracker, ClassificationBatcher, CLASSIFICATION_UI_HZ,
+    FALL_CONFIRM_SECONDS, FALL_CLEAR_SECONDS, FALL_CONFIRM_CONFIDENCE,
+)
+
+
+class ListStreakTracker(FallStreakTracker):
+    """The old tracker verbatim: same streak logic and prints, only the
+    confidence window is a list rebuilt and re-summed per detection."""
+
+    def __init__(self):
+        super().__init__()
+        self.recent_confidences = []
+
+    def reset(self):
+        super().reset()
+        self.recent_confidences = []
+
+    def update(self, now, is_fall, confidence=0.0):
+        triggered = False
+        if is_fall:
+            self.clear_streak_start = None
+            self.recent_confidences.append((now, confidence))
+            self.recent_confidences = [(t, c) for t, c in self.recent_confidences if (now - t).total_seconds() <= FALL_CONFIRM_SECONDS]
+            if not self.confirmed:
+                if self.fall_streak_start is None:
+                    self.fall_streak_start = now
+                    print("[StreakTracker] Fall streak started.")
+                else:
+                    streak = (now - self.fall_streak_start).total_seconds()
+                    print(f"[StreakTracker] Fall streak: {streak:.1f}s / {FALL_CONFIRM_SECONDS}s needed")
+                    if streak >= FALL_CONFIRM_SECONDS:
+                        avg_confidence = sum(c for _, c in self.recent_confidences) / len(self.recent_confidences) if self.recent_confidences else 0.0
+                        if avg_confidence > FALL_CONFIRM_CONFIDENCE:
+                            self.confirmed = True
+                            triggered = True
+                            print(f"[StreakTracker] Fall CONFIRMED after {streak:.1f}s. Avg confidence: {avg_confidence:.2f}")
+                        else:
+                            print(f"[StreakTracker] Streak reached but avg conf ({avg_confidence:.2f}) <= {FALL_CONFIRM_CONFIDENCE}. Waiting...")
+        else:
+            self.fall_streak_start = None
+            self.recent_confidences = []
+            if self.confirmed:
+                if self.clear_streak_start is None:
+                    self.clear_streak_start = now
+                else:
+                    streak = (now - self.clear_streak_start).total_seconds()
+                    if streak >= FALL_CLEAR_SECONDS:
+                        self.confirmed = False
+                        self.clear_streak_start = None
+                        print(f"[StreakTracker] Fall cleared.")
+        return triggered
+
+
+def synthetic_stream(rate, seconds, seed=0):
+    """Alternating person / fall episodes, `rate` classifications per second."""
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    step = timedelta(seconds=1.0 / rate)
+    falling = False
+    for i in range(int(rate * seconds)):
+        if i % int(rate * 20) == 0:
+            falling = not falling
+        if falling:
+            yield now, {"fall": rng.uniform(0.85, 1.0)}
+        else:
+            yield now, {"person": rng.uniform(0.6, 1.0)}
+        now += step
+
+
+def bench_tracker(tracker, samples):
+    triggers = 0
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for now, classes in samples:
+            triggers += tracker.update(now, "fall" in classes, classes.get("fall", 0.0))
+    return time.perf_counter() - start, triggers
+
+
+def bench_ui(samples, rate):
+    sent = []
+
+    start = time.perf_counter()
+    for now, classes in samples:
+        sent.append(json.dumps([{"content": k, "confidence": v, "timestamp": now.isoformat()}
+                                for k, v in classes.items()]))
+    per_detection = (time.perf_counter() - start, len(sent))
+
+    sent.clear()
+    batcher = ClassificationBatcher(sent.append)
+    flush_every = max(1, int(rate / CLASSIFICATION_UI_HZ))
+    start = time.perf_counter()
+    for i, (now, classes) in enumerate(samples, 1):
+        batcher.add(now, classes)
+        if i % flush_every == 0:
+            batcher.flush()
+    batcher.flush()
+    batched = (time.perf_counter() - start, len(sent))
+    return per_detection, batched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UnderWatch tracking benchmark")
+    parser.add_argument("--rate", type=float, default=200.0, help="classifications per second")
+    parser.add_argument("--seconds", type=float, default=600.0, help="simulated stream length")
+    args = parser.parse_args()
+
+    samples = list(synthetic_stream(args.rate, args.seconds))
+    print(f"[Bench] {len(samples)} classifications at {args.rate:.0f}/s ({args.seconds:.0f}s simulated)")
+
+    old, old_triggers = bench_tracker(ListStreakTracker(), samples)
+    new, new_triggers = bench_tracker(FallStreakTracker(), samples)
+    if old_triggers != new_triggers:
+        print(f"[Bench] WARNING: trackers disagree ({old_triggers} vs {new_triggers} confirmed falls)")
+    print(f"[Bench] Streak tracker  list: {old * 1e6 / len(samples):8.2f} us/update")
+    print(f"[Bench] Streak tracker deque: {new * 1e6 / len(samples):8.2f} us/update")
+
+    (old_t, old_n), (new_t, new_n) = bench_ui(samples, args.rate)
+    print(f"[Bench] UI per detection: {old_n:7d} messages, {old_t:.3f}s encoding")
+    print(f"[Bench] UI batched      : {new_n:7d} messages, {new_t:.3f}s encoding")
+
+
+if __name__ == "__main__":
+    main()
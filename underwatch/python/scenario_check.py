@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: Copyright (C) ARDUINO SRL (http://www.arduino.cc)
+# SPDX-License-Identifier: MPL-2.0
+
+"""Escalation scenarios for FallAlertFlow on a frozen virtual clock.
+
+COUNTDOWN_1 -> COUNTDOWN_2 -> stand-up bonus -> EMERGENCY, plus dismissal,
+stepped with TimerService.advance() so each stage deadline fires at
+exactly its due time. Does not need the App Lab bricks or the network.
+
+    python scenario_check.py
+"""
+
+from datetime import datetime, UTC
+import sys
+
+from alert_flow import FallAlertFlow, COUNTDOWN_1_SECONDS, COUNTDOWN_2_SECONDS, ADDITIONAL_TIME_ON_STAND
+from timer_service import TimerService, VirtualClock
+
+failures = []
+
+
+class RecordingUI:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, kind, message=None):
+        self.messages.append((kind, message))
+
+    def sent(self, kind):
+        return [m for k, m in self.messages if k == kind]
+
+
+def expect(label, got, want):
+    ok = got == want
+    print(f"[Check] {'ok  ' if ok else 'FAIL'} {label}: {got!r}" + ("" if ok else f" (expected {want!r})"))
+    if not ok:
+        failures.append(label)
+
+
+def setup():
+    timers = TimerService(VirtualClock(speed=0), name="ScenarioTimers").start()
+    ui, pushes = RecordingUI(), []
+    flow = FallAlertFlow(ui, timers, notify=lambda title, *rest: pushes.append(title))
+    return timers, ui, pushes, flow
+
+
+def scenario_full_escalation():
+    print("[Check] Fall, family notified, person stands, emergency")
+    timers, ui, pushes, flow = setup()
+    flow.trigger_fall(datetime.now(UTC))
+    expect("state after fall", flow.state, "COUNTDOWN_1")
+    expect("first countdown", flow.remaining(), COUNTDOWN_1_SECONDS)
+
+    # Standing during COUNTDOWN_1 earns nothing
+    flow.update(datetime.now(UTC), False, True)
+    expect("no bonus in COUNTDOWN_1", flow.remaining(), COUNTDOWN_1_SECONDS)
+
+    timers.advance(COUNTDOWN_1_SECONDS - 0.1)
+    expect("state just before stage 1 expiry", flow.state, "COUNTDOWN_1")
+    timers.advance(0.1)
+    expect("state at stage 1 expiry", flow.state, "COUNTDOWN_2")
+    expect("second countdown", flow.remaining(), COUNTDOWN_2_SECONDS)
+
+    timers.advance(10)
+    flow.update(datetime.now(UTC), False, True)
+    left = COUNTDOWN_2_SECONDS - 10 + ADDITIONAL_TIME_ON_STAND
+    expect("countdown after stand-up bonus", flow.remaining(), left)
+    flow.update(datetime.now(UTC), False, True)
+    expect("bonus applied once", flow.remaining(), left)
+
+    timers.advance(left - 0.1)
+    expect("state just before stage 2 expiry", flow.state, "COUNTDOWN_2")
+    timers.advance(0.1)
+    expect("state at stage 2 expiry", flow.state, "EMERGENCY")
+    expect("fall_alert messages", ui.sent("fall_alert"),
+           ["LOCAL_WARNING_STARTED", "FAMILY_NOTIFIED", "EMERGENCY_SERVICES_CALLED"])
+    expect("pushes", pushes, ["UnderWatch - Fall Detected", "UnderWatch - Family Notified", "UnderWatch - EMERGENCY"])
+
+    # Status text only goes out when the shown seconds change
+    statuses = [m for m in ui.sent("alert_status") if m.startswith("WARNING")]
+    expect("COUNTDOWN_1 status updates", len(statuses), COUNTDOWN_1_SECONDS)
+    timers.stop()
+
+
+def scenario_dismiss():
+    print("[Check] Fall, dismissed before the family is notified")
+    timers, ui, pushes, flow = setup()
+    flow.trigger_fall(datetime.now(UTC))
+    timers.advance(COUNTDOWN_1_SECONDS / 2)
+    flow.dismiss()
+    timers.advance(COUNTDOWN_1_SECONDS + COUNTDOWN_2_SECONDS)
+    expect("state after dismiss", flow.state, "IDLE")
+    expect("fall_alert messages", ui.sent("fall_alert"), ["LOCAL_WARNING_STARTED", "ALERT_DISMISSED"])
+    flow.trigger_fall(datetime.now(UTC))
+    expect("next fall starts a new countdown", flow.state, "COUNTDOWN_1")
+    timers.stop()
+
+
+def main():
+    scenario_full_escalation()
+    scenario_dismiss()
+    print(f"[Check] {'FAIL: ' + ', '.join(failures) if failures else 'All scenarios passed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
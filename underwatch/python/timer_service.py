@@ -0,0 +1,274 @@
+# Mirror of ../../timer_service.py, written by sync_underwatch.py.
+# Do not edit here: change the canonical copy and re-run the script.
+
+import heapq
+import itertools
+import threading
+import time
+
+# Stale heap entries (cancelled or rescheduled timers) are dropped in one
+# pass once the heap grows past this and more than half of it is stale
+HEAP_COMPACT_MIN = 256
+
+
+class MonotonicClock:
+    """Wall-independent clock backed by time.monotonic()."""
+
+    def now(self):
+        return time.monotonic()
+
+    def wait(self, cond, timeout):
+        # cond must be held by the caller
+        cond.wait(timeout)
+
+
+class VirtualClock:
+    """Clock that runs `speed` times faster than real time, so escalation
+    scenarios play out in milliseconds. speed=0 freezes it: time then only
+    moves through TimerService.advance(), which fires every timer at its
+    exact deadline on the caller's thread."""
+
+    def __init__(self, speed=1000.0, start=0.0):
+        self.speed = speed
+        self._base = start
+        self._real_start = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters = []
+
+    def now(self):
+        with self._lock:
+            return self._base + (time.monotonic() - self._real_start) * self.speed
+
+    @property
+    def frozen(self):
+        return self.speed <= 0
+
+    def advance(self, seconds):
+        self.advance_to(self.now() + seconds)
+
+    def advance_to(self, t):
+        with self._lock:
+            self._base = t - (time.monotonic() - self._real_start) * self.speed
+            waiters = list(self._waiters)
+        for cond in waiters:
+            with cond:
+                cond.notify_all()
+
+    def wait(self, cond, timeout):
+        with self._lock:
+            self._waiters.append(cond)
+        try:
+            if timeout is None:
+                cond.wait()
+            else:
+                cond.wait(timeout / self.speed)
+        finally:
+            with self._lock:
+                self._waiters.remove(cond)
+
+
+class Timer:
+    """Handle returned by TimerService.schedule(). Use the service to
+    cancel or move it."""
+
+    def __init__(self, deadline, callback, args, interval):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+        self.fired = False
+        self._seq = None
+
+    @property
+    def active(self):
+        return not self.cancelled and (not self.fired or self.interval is not None)
+
+
+class TimerService:
+    """Min-heap of deadlines serviced by one background thread.
+
+    Deadlines are on the service clock (monotonic by default), so they
+    fire on time no matter how slowly frames or detections arrive.
+    Rescheduling pushes a fresh heap entry and the stale one is skipped
+    when it surfaces. Callbacks run on the timer thread and must not
+    block for long.
+
+    With a frozen VirtualClock there is no thread: advance() steps the
+    clock deadline by deadline and runs callbacks before returning, so
+    "advance, then check" is deterministic.
+    """
+
+    def __init__(self, clock=None, name="TimerService"):
+        self.clock = clock or MonotonicClock()
+        self.name = name
+        self._heap = []
+        self._compact_at = HEAP_COMPACT_MIN
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    @property
+    def _stepped(self):
+        return getattr(self.clock, "frozen", False)
+
+    def now(self):
+        return self.clock.now()
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        if self._stepped:
+            return self
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    # ── Scheduling ───────────────────────────────────────────────────
+    def schedule(self, delay, callback, *args):
+        return self.schedule_at(self.now() + delay, callback, *args)
+
+    def schedule_at(self, deadline, callback, *args):
+        timer = Timer(deadline, callback, args, None)
+        with self._cond:
+            self._push(timer)
+        return timer
+
+    def schedule_every(self, interval, callback, *args, first_delay=None):
+        if interval <= 0:
+            # _pop_due would re-push it at now + 0 forever
+            raise ValueError(f"interval must be positive, got {interval}")
+        delay = interval if first_delay is None else first_delay
+        timer = Timer(self.now() + delay, callback, args, interval)
+        with self._cond:
+            self._push(timer)
+        return timer
+
+    def cancel(self, timer):
+        if timer is None:
+            return
+        with self._cond:
+            timer.cancelled = True
+            timer._seq = None
+
+    def reschedule(self, timer, deadline):
+        with self._cond:
+            if timer.cancelled or (timer.fired and timer.interval is None):
+                return False
+            timer.deadline = deadline
+            self._push(timer)
+        return True
+
+    def shift(self, timer, delta):
+        """Move a pending timer by delta seconds (negative pulls it in)."""
+        with self._cond:
+            if timer.cancelled or (timer.fired and timer.interval is None):
+                return False
+            timer.deadline += delta
+            self._push(timer)
+        return True
+
+    def remaining(self, timer):
+        if timer is None or not timer.active:
+            return None
+        return max(0.0, timer.deadline - self.now())
+
+    # ── Frozen virtual clocks ────────────────────────────────────────
+    def run_due(self):
+        """Run every timer due at the current clock time on this thread."""
+        with self._cond:
+            due, _ = self._pop_due()
+        self._fire(due)
+
+    def advance(self, seconds):
+        """Step a frozen VirtualClock forward, firing each timer due on the
+        way with the clock set to that timer's own deadline."""
+        if not self._stepped:
+            raise RuntimeError("advance() needs a frozen VirtualClock")
+        target = self.now() + seconds
+        while True:
+            with self._cond:
+                deadline = self._next_deadline()
+            if deadline is None or deadline > target:
+                break
+            self.clock.advance_to(max(deadline, self.now()))
+            self.run_due()
+        self.clock.advance_to(target)
+
+    # ── Internals ────────────────────────────────────────────────────
+    def _next_deadline(self):
+        # caller holds self._cond; drops stale entries from the top
+        while self._heap:
+            deadline, seq, timer = self._heap[0]
+            if timer._seq == seq:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def _push(self, timer):
+        # caller holds self._cond
+        timer._seq = next(self._counter)
+        heapq.heappush(self._heap, (timer.deadline, timer._seq, timer))
+        if len(self._heap) >= self._compact_at:
+            self._compact()
+        self._cond.notify_all()
+
+    def _compact(self):
+        live = [entry for entry in self._heap if entry[2]._seq == entry[1]]
+        if len(live) * 2 < len(self._heap):
+            heapq.heapify(live)
+            self._heap = live
+        self._compact_at = max(HEAP_COMPACT_MIN, 2 * len(self._heap))
+
+    def _pop_due(self):
+        # caller holds self._cond; returns (due timers, seconds until next)
+        due = []
+        while self._heap:
+            deadline, seq, timer = self._heap[0]
+            if timer._seq != seq:
+                heapq.heappop(self._heap)
+                continue
+            if deadline > self.now():
+                return due, deadline - self.now()
+            heapq.heappop(self._heap)
+            if timer.interval is not None:
+                timer.deadline = deadline + timer.interval
+                if timer.deadline <= self.now():
+                    # Missed ticks are dropped rather than replayed
+                    timer.deadline = self.now() + timer.interval
+                self._push(timer)
+            else:
+                timer.fired = True
+                timer._seq = None
+            due.append(timer)
+        return due, None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                due, wait = self._pop_due()
+                if not due:
+                    self.clock.wait(self._cond, wait)
+                    continue
+            self._fire(due)
+
+    def _fire(self, due):
+        for timer in due:
+            if timer.cancelled:
+                continue
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                print(f"[{self.name}] Timer callback error: {e}")
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: Copyright (C) ARDUINO SRL (http://www.arduino.cc)
+# SPDX-License-Identifier: MPL-2.0
+
+from collections import deque
+import json
+import threading
+
+FALL_CONFIRM_SECONDS     = 5.0
+FALL_CLEAR_SECONDS       = 1.5
+FALL_CONFIRM_CONFIDENCE  = 0.9
+CLASSIFICATION_UI_HZ     = 5     # classification batches pushed to the WebUI per second
+CLASSIFICATION_BATCH_MAX = 64    # detections kept between flushes; oldest dropped first
+
+
+# ── Windowed confidence ───────────────────────────────────────────────────────
+class ConfidenceWindow:
+    """Confidences seen in the last `seconds`, with a running sum so the
+    average is O(1) per sample instead of a rebuild per detection."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.samples = deque()
+        self.total   = 0.0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, now, confidence):
+        self.samples.append((now, confidence))
+        self.total += confidence
+        while self.samples and (now - self.samples[0][0]).total_seconds() > self.seconds:
+            _, old = self.samples.popleft()
+            self.total -= old
+
+    def average(self):
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def clear(self):
+        self.samples.clear()
+        self.total = 0.0
+
+
+# ── Fall Streak Tracker ───────────────────────────────────────────────────────
+class FallStreakTracker:
+    def __init__(self):
+        self.fall_streak_start  = None
+        self.clear_streak_start = None
+        self.confirmed          = False
+        self.recent_confidences = ConfidenceWindow(FALL_CONFIRM_SECONDS)
+
+    def reset(self):
+        self.fall_streak_start  = None
+        self.clear_streak_start = None
+        self.confirmed          = False
+        self.recent_confidences.clear()
+        print("[StreakTracker] Reset.")
+
+    def update(self, now, is_fall, confidence=0.0):
+        triggered = False
+        if is_fall:
+            self.clear_streak_start = None
+            self.recent_confidences.add(now, confidence)
+            if not self.confirmed:
+                if self.fall_streak_start is None:
+                    self.fall_streak_start = now
+                    print("[StreakTracker] Fall streak started.")
+                else:
+                    streak = (now - self.fall_streak_start).total_seconds()
+                    print(f"[StreakTracker] Fall streak: {streak:.1f}s / {FALL_CONFIRM_SECONDS}s needed")
+                    if streak >= FALL_CONFIRM_SECONDS:
+                        avg_confidence = self.recent_confidences.average()
+                        if avg_confidence > FALL_CONFIRM_CONFIDENCE:
+                            self.confirmed = True
+                            triggered = True
+                            print(f"[StreakTracker] Fall CONFIRMED after {streak:.1f}s. Avg confidence: {avg_confidence:.2f}")
+                        else:
+                            print(f"[StreakTracker] Streak reached but avg conf ({avg_confidence:.2f}) <= {FALL_CONFIRM_CONFIDENCE}. Waiting...")
+        else:
+            self.fall_streak_start = None
+            self.recent_confidences.clear()
+            if self.confirmed:
+                if self.clear_streak_start is None:
+                    self.clear_streak_start = now
+                else:
+                    streak = (now - self.clear_streak_start).total_seconds()
+                    if streak >= FALL_CLEAR_SECONDS:
+                        self.confirmed = False
+                        self.clear_streak_start = None
+                        print(f"[StreakTracker] Fall cleared.")
+        return triggered
+
+
+# ── Classification Batcher ────────────────────────────────────────────────────
+class ClassificationBatcher:
+    """Collects classification results between flushes and sends them as
+    one `classifications` message, a JSON list of per-detection entry
+    lists. flush() is meant to run on a fixed-rate timer."""
+
+    def __init__(self, send, max_pending=CLASSIFICATION_BATCH_MAX):
+        self.send    = send
+        self.pending = deque(maxlen=max_pending)
+        self.lock    = threading.Lock()
+
+    def add(self, now, classifications):
+        stamp = now.isoformat()
+        with self.lock:
+            self.pending.append((stamp, dict(classifications)))
+
+    def flush(self):
+        with self.lock:
+            if not self.pending:
+                return
+            batch = list(self.pending)
+            self.pending.clear()
+        self.send(json.dumps([
+            [{"content": key, "confidence": value, "timestamp": stamp}
+             for key, value in classifications.items()]
+            for stamp, classifications in batch
+        ]))